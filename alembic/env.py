@@ -4,6 +4,9 @@ from config import Config
 from db.base import Base
 from db.models.user import User
 from db.models.tracked_item import TrackedItem
+from db.models.price_observation import PriceObservation
+from db.models.price_rollup import PriceRollup
+from db.models.alert_outbox import AlertOutbox
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
@@ -0,0 +1,48 @@
+"""Add price history tables
+
+Revision ID: 3f8a6d2b9e17
+Revises: 7c2d95f4e8a1
+Create Date: 2026-10-18 13:40:12.865304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a6d2b9e17'
+down_revision: Union[str, None] = '7c2d95f4e8a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('price_observations',
+    sa.Column('tracked_item_id', sa.Integer(), nullable=False),
+    sa.Column('observed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('price', sa.Float(precision=24), nullable=False),
+    sa.ForeignKeyConstraint(['tracked_item_id'], ['tracked_items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tracked_item_id', 'observed_at')
+    )
+    op.create_index('ix_price_observations_observed_at', 'price_observations', ['observed_at'], unique=False, postgresql_using='brin')
+    op.create_table('price_rollups',
+    sa.Column('tracked_item_id', sa.Integer(), nullable=False),
+    sa.Column('bucket_seconds', sa.Integer(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('min_price', sa.Float(precision=24), nullable=False),
+    sa.Column('max_price', sa.Float(precision=24), nullable=False),
+    sa.Column('avg_price', sa.Float(precision=24), nullable=False),
+    sa.Column('samples', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tracked_item_id'], ['tracked_items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tracked_item_id', 'bucket_seconds', 'bucket_start')
+    )
+    op.create_index('ix_price_rollups_bucket_start', 'price_rollups', ['bucket_start'], unique=False, postgresql_using='brin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_price_rollups_bucket_start', table_name='price_rollups', postgresql_using='brin')
+    op.drop_table('price_rollups')
+    op.drop_index('ix_price_observations_observed_at', table_name='price_observations', postgresql_using='brin')
+    op.drop_table('price_observations')
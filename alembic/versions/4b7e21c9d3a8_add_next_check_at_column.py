@@ -0,0 +1,32 @@
+"""Add next_check_at column
+
+Revision ID: 4b7e21c9d3a8
+Revises: dc85b3eece5c
+Create Date: 2026-10-18 10:12:31.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e21c9d3a8'
+down_revision: Union[str, None] = 'dc85b3eece5c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tracked_items', sa.Column('next_check_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute('UPDATE tracked_items SET next_check_at = last_checked_at')
+    op.alter_column('tracked_items', 'next_check_at',
+               existing_type=sa.DateTime(timezone=True),
+               nullable=False)
+    op.create_index(op.f('ix_tracked_items_next_check_at'), 'tracked_items', ['next_check_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tracked_items_next_check_at'), table_name='tracked_items')
+    op.drop_column('tracked_items', 'next_check_at')
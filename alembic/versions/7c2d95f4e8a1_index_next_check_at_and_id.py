@@ -0,0 +1,28 @@
+"""Index next_check_at and id
+
+Revision ID: 7c2d95f4e8a1
+Revises: e5d08a7b1c94
+Create Date: 2026-10-18 12:26:55.042183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2d95f4e8a1'
+down_revision: Union[str, None] = 'e5d08a7b1c94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f('ix_tracked_items_next_check_at'), table_name='tracked_items')
+    op.create_index('ix_tracked_items_next_check_at_id', 'tracked_items', ['next_check_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tracked_items_next_check_at_id', table_name='tracked_items')
+    op.create_index(op.f('ix_tracked_items_next_check_at'), 'tracked_items', ['next_check_at'], unique=False)
@@ -0,0 +1,31 @@
+"""Add check_interval column
+
+Revision ID: a91f3c6e0b52
+Revises: 4b7e21c9d3a8
+Create Date: 2026-10-18 11:03:47.581920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91f3c6e0b52'
+down_revision: Union[str, None] = '4b7e21c9d3a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows start at the old fixed interval and adapt from there
+    op.add_column('tracked_items', sa.Column('check_interval', sa.Integer(), nullable=False, server_default='1800'))
+    op.alter_column('tracked_items', 'check_interval',
+               existing_type=sa.Integer(),
+               existing_nullable=False,
+               server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column('tracked_items', 'check_interval')
@@ -0,0 +1,148 @@
+"""Add canonical link column
+
+Revision ID: b6e4f1a08c35
+Revises: 3f8a6d2b9e17
+Create Date: 2026-10-18 15:02:37.518240
+
+"""
+import re
+from typing import Optional, Sequence, Union
+from urllib.parse import SplitResult, parse_qsl, urlencode, urlsplit, urlunsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e4f1a08c35'
+down_revision: Union[str, None] = '3f8a6d2b9e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of scraper.canonical as of this revision, so the backfill
+# stays reproducible when the application's rules change later
+
+TRACKING_PARAMS = (
+    "utm_", "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "srsltid", "sessionid", "session_id",
+)
+
+AMAZON_ASIN = re.compile(
+    r"/(?:dp|gp/product|gp/aw/d|exec/obidos/asin|o/asin)/([A-Z0-9]{10})(?:[/?]|$)",
+    re.I
+)
+
+FLIPKART_PARAMS = ("pid",)
+
+
+def _host(parts: SplitResult) -> str:
+    return (parts.hostname or "").lower()
+
+
+def _is_shop(host: str, name: str) -> bool:
+    return name in host.split(".")[:-1]
+
+
+def _amazon(parts: SplitResult) -> Optional[str]:
+    match = AMAZON_ASIN.search(parts.path)
+    if not match:
+        return None
+    tld = _host(parts).split("amazon.", 1)[1]
+    return f"https://www.amazon.{tld}/dp/{match.group(1).upper()}"
+
+
+def _flipkart(parts: SplitResult) -> Optional[str]:
+    path = parts.path
+    if path.startswith("/dl/"):
+        path = path[3:]
+    if "/p/" not in path:
+        return None
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query)
+        if key in FLIPKART_PARAMS
+    ]
+    return urlunsplit(("https", "www.flipkart.com", path.rstrip("/"), urlencode(query), ""))
+
+
+SHOP_RULES = [
+    ("amazon", _amazon),
+    ("flipkart", _flipkart),
+]
+
+
+MOBILE_HOST_PREFIXES = ("m.", "mobile.", "amp.")
+
+
+def _route_fragment(fragment: str) -> str:
+    return fragment if fragment.startswith(("/", "!")) else ""
+
+
+def _strip_amp(path: str) -> str:
+    path = re.sub(r"^/amp(?=/)", "", path)
+    return re.sub(r"/amp/?$", "", path)
+
+
+def canonicalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    host = _host(parts)
+    for name, rule in SHOP_RULES:
+        if _is_shop(host, name):
+            canonical = rule(parts)
+            if canonical:
+                return canonical
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS) and key.lower() != "amp"
+    )
+    for prefix in MOBILE_HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    netloc = f"{host}:{parts.port}" if parts.port else host
+    path = _strip_amp(parts.path).rstrip("/") or "/"
+    return urlunsplit((
+        parts.scheme.lower(), netloc, path, urlencode(query), _route_fragment(parts.fragment)
+    ))
+
+
+def upgrade() -> None:
+    op.add_column('tracked_items', sa.Column('canonical_link', sa.String(), nullable=True))
+
+    # Canonicalization lives in Python, so existing links are backfilled in batches
+    tracked_items = sa.table(
+        'tracked_items',
+        sa.column('id', sa.Integer()),
+        sa.column('link', sa.String()),
+        sa.column('canonical_link', sa.String()),
+    )
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(tracked_items.c.id, tracked_items.c.link)
+            .where(tracked_items.c.id > last_id)
+            .order_by(tracked_items.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            tracked_items.update()
+            .where(tracked_items.c.id == sa.bindparam('item_id'))
+            .values(canonical_link=sa.bindparam('canonical')),
+            [{'item_id': row.id, 'canonical': canonicalize_url(row.link)} for row in rows]
+        )
+        last_id = rows[-1].id
+
+    op.alter_column('tracked_items', 'canonical_link',
+               existing_type=sa.String(),
+               nullable=False)
+    op.create_index(op.f('ix_tracked_items_canonical_link'), 'tracked_items', ['canonical_link'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tracked_items_canonical_link'), table_name='tracked_items')
+    op.drop_column('tracked_items', 'canonical_link')
@@ -0,0 +1,28 @@
+"""Add lease columns
+
+Revision ID: e5d08a7b1c94
+Revises: a91f3c6e0b52
+Create Date: 2026-10-18 11:48:09.317465
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5d08a7b1c94'
+down_revision: Union[str, None] = 'a91f3c6e0b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tracked_items', sa.Column('leased_by', sa.String(), nullable=True))
+    op.add_column('tracked_items', sa.Column('leased_until', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('tracked_items', 'leased_until')
+    op.drop_column('tracked_items', 'leased_by')
@@ -1,5 +1,6 @@
 
 import os
+import socket
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -13,6 +14,10 @@ class Config:
     LLM_TOKEN = os.getenv("GROQ_TOKEN")
     LLM_MODEL = os.getenv("LLM_MODEL")
     LLM_TEMPERATURE = 0.0
+    LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", 5))
+    LLM_BATCH_TOKEN_BUDGET = int(os.getenv("LLM_BATCH_TOKEN_BUDGET", 6000))
+    LLM_BATCH_WINDOW = float(os.getenv("LLM_BATCH_WINDOW", 2.0))
+    LLM_EXCERPT_TOKENS = int(os.getenv("LLM_EXCERPT_TOKENS", 1500))
 
     # DB Configs
     DB_SERVICE_URI = os.getenv("DB_SERVICE_URI")
@@ -23,3 +28,86 @@ class Config:
     # App config
     MAX_ITEM_LIMIT = 5
     CRON_INTERVAL = 10
+
+    # Price checker config
+    CHECK_INTERVAL = int(os.getenv("CHECK_INTERVAL", 1800))
+    MIN_CHECK_INTERVAL = int(os.getenv("MIN_CHECK_INTERVAL", 600))
+    MAX_CHECK_INTERVAL = int(os.getenv("MAX_CHECK_INTERVAL", 86400))
+    CHECK_BACKOFF_FACTOR = float(os.getenv("CHECK_BACKOFF_FACTOR", 2.0))
+    CHECK_BATCH_SIZE = int(os.getenv("CHECK_BATCH_SIZE", 20))
+    CHECK_RATE = float(os.getenv("CHECK_RATE", 1.0))
+    CHECK_LEASE_SECONDS = int(os.getenv("CHECK_LEASE_SECONDS", 600))
+    # Unfinished checks are abandoned before the batch's lease runs out
+    CHECK_CYCLE_TIMEOUT = float(os.getenv("CHECK_CYCLE_TIMEOUT", 540))
+    WORKER_ID = os.getenv("WORKER_ID") or f"{socket.gethostname()}-{os.getpid()}"
+    CHECK_FLUSH_SIZE = int(os.getenv("CHECK_FLUSH_SIZE", 50))
+    CHECK_FLUSH_INTERVAL = int(os.getenv("CHECK_FLUSH_INTERVAL", 5))
+    CHECK_CONCURRENCY = int(os.getenv("CHECK_CONCURRENCY", 8))
+    CHECK_DOMAIN_CONCURRENCY = int(os.getenv("CHECK_DOMAIN_CONCURRENCY", 2))
+
+    # Price history config
+    PRICE_ROLLUP_INTERVAL = int(os.getenv("PRICE_ROLLUP_INTERVAL", 3600))
+    PRICE_RAW_RETENTION_DAYS = int(os.getenv("PRICE_RAW_RETENTION_DAYS", 7))
+    PRICE_HOURLY_RETENTION_DAYS = int(os.getenv("PRICE_HOURLY_RETENTION_DAYS", 90))
+    PRICE_DAILY_RETENTION_DAYS = int(os.getenv("PRICE_DAILY_RETENTION_DAYS", 730))
+
+    # Alert delivery config
+    ALERT_GLOBAL_RATE = float(os.getenv("ALERT_GLOBAL_RATE", 25))
+    ALERT_CHAT_RATE = float(os.getenv("ALERT_CHAT_RATE", 1))
+    ALERT_SENDERS = int(os.getenv("ALERT_SENDERS", 10))
+    ALERT_MAX_ATTEMPTS = int(os.getenv("ALERT_MAX_ATTEMPTS", 5))
+    ALERT_DIGEST = os.getenv("ALERT_DIGEST", "true").lower() == "true"
+    ALERT_DIGEST_WINDOW = float(os.getenv("ALERT_DIGEST_WINDOW", 60))
+    # Alerts travel from checker processes to the bot through the outbox table
+    ALERT_OUTBOX_BATCH = int(os.getenv("ALERT_OUTBOX_BATCH", 100))
+    ALERT_OUTBOX_POLL_INTERVAL = float(os.getenv("ALERT_OUTBOX_POLL_INTERVAL", 2))
+    ALERT_OUTBOX_LEASE_SECONDS = int(os.getenv("ALERT_OUTBOX_LEASE_SECONDS", 300))
+
+    # Scraper config
+    SCRAPER_MAX_WORKERS = int(os.getenv("SCRAPER_MAX_WORKERS", 8))
+    SCRAPER_PARSE_PROCESSES = int(os.getenv("SCRAPER_PARSE_PROCESSES", 2))
+    SCRAPER_LLM_PROCESSES = int(os.getenv("SCRAPER_LLM_PROCESSES", 4))
+    SCRAPE_TIMEOUT = float(os.getenv("SCRAPE_TIMEOUT", 120))
+    PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", 20))
+    SCRAPER_DB_PATH = os.getenv("SCRAPER_DB_PATH", "data/scraper.sqlite3")
+    EXTRACTION_CACHE_TTL = int(os.getenv("EXTRACTION_CACHE_TTL", 86400))
+    EXTRACTION_CACHE_MEMORY_SIZE = int(os.getenv("EXTRACTION_CACHE_MEMORY_SIZE", 1000))
+    EXTRACTION_CACHE_DISK_SIZE = int(os.getenv("EXTRACTION_CACHE_DISK_SIZE", 100000))
+    SCRAPER_MAX_CONNECTIONS = int(os.getenv("SCRAPER_MAX_CONNECTIONS", 50))
+    SCRAPER_FETCH_TIMEOUT = float(os.getenv("SCRAPER_FETCH_TIMEOUT", 15))
+    SCRAPER_USER_AGENT = os.getenv(
+        "SCRAPER_USER_AGENT",
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
+    )
+
+    # Headless browser pool for JavaScript-rendered shops
+    RENDER_DOMAINS = [
+        domain.strip().lower()
+        for domain in os.getenv("RENDER_DOMAINS", "").split(",")
+        if domain.strip()
+    ]
+    BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", 2))
+    BROWSER_CONCURRENCY = int(os.getenv("BROWSER_CONCURRENCY", 4))
+    BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", 100))
+    BROWSER_MEMORY_LIMIT_MB = int(os.getenv("BROWSER_MEMORY_LIMIT_MB", 1024))
+    BROWSER_PAGE_TIMEOUT = float(os.getenv("BROWSER_PAGE_TIMEOUT", 30))
+
+    # Per-domain politeness: requests per second adapt between the min and
+    # max rate, backing off on 429/503 or slow responses
+    SCRAPER_DOMAIN_RATE = float(os.getenv("SCRAPER_DOMAIN_RATE", 0.5))
+    SCRAPER_DOMAIN_MIN_RATE = float(os.getenv("SCRAPER_DOMAIN_MIN_RATE", 0.05))
+    SCRAPER_DOMAIN_MAX_RATE = float(os.getenv("SCRAPER_DOMAIN_MAX_RATE", 2.0))
+    SCRAPER_DOMAIN_BURST = float(os.getenv("SCRAPER_DOMAIN_BURST", 2))
+    SCRAPER_DOMAIN_MIN_SPACING = float(os.getenv("SCRAPER_DOMAIN_MIN_SPACING", 0.5))
+    SCRAPER_RATE_INCREASE = float(os.getenv("SCRAPER_RATE_INCREASE", 0.05))
+    SCRAPER_RATE_DECREASE = float(os.getenv("SCRAPER_RATE_DECREASE", 0.5))
+    SCRAPER_SLOW_RESPONSE = float(os.getenv("SCRAPER_SLOW_RESPONSE", 5))
+
+    # Per-domain circuit breaker over scrape outcomes
+    CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", 20))
+    CIRCUIT_MIN_SAMPLES = int(os.getenv("CIRCUIT_MIN_SAMPLES", 5))
+    CIRCUIT_ERROR_RATE = float(os.getenv("CIRCUIT_ERROR_RATE", 0.5))
+    # Share of fetched pages yielding no product that opens the circuit
+    CIRCUIT_EXTRACTION_ERROR_RATE = float(os.getenv("CIRCUIT_EXTRACTION_ERROR_RATE", 0.8))
+    CIRCUIT_COOLDOWN = float(os.getenv("CIRCUIT_COOLDOWN", 900))
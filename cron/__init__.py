@@ -1 +1,3 @@
 from .price_checker import check_price_drops
+from .scheduler import price_check_scheduler
+from .rollup import price_history_rollup
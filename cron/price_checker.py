@@ -1,124 +1,325 @@
+import asyncio
 import datetime
+import itertools
+import time
+from typing import Dict, List, Optional, Set
 from aiogram.enums import ParseMode
+from sqlalchemy import Row
+from config import Config
 from db.core import get_db
-from db.models import TrackedItem, User
+from db.models import TrackedItem
+from db.repositories.alert_outbox import AlertOutboxRepository
 from db.repositories.tracked_item import TrackedItemRepository
-from db.repositories.user import UserRepository
+from notifier.messages import format_digest_entry, format_message
+from scraper.health import domain_health
+from scraper.politeness import domain_scheduler
 from scraper.scraper import scraper
 from utils.logger import get_logger
-from bot import bot
+from utils.url import get_domain
+from .write_back import CheckResultBuffer
 
 logger = get_logger(__name__)
 
 class PriceAlert:
-    """Formats and sends price alert messages."""
-    
-    @staticmethod
-    def format_message(item: TrackedItem, current_price: float) -> str:
-        return (
-            f"🎉 Price Alert for *{item.name}*!\n\n"
-            f"💰 Current Price: *{item.currency} {current_price}*\n"
-            f"🎯 Your Target Price: *{item.currency} {item.target_price}*\n\n"
-            f"🔗 Check it out here: [Link]({item.link})\n\n"
-            f"Act fast before it changes again!"
-        )
-    
-    @staticmethod
-    async def send_alert(item: TrackedItem, current_price: float, user_id: int) -> None:
+    """
+    Writes price alert messages, formatted by notifier.messages, to the
+    alert outbox, from which the bot process delivers them.
+
+    In digest mode each drop is also stored with its digest entry, and the
+    outbox relay combines a chat's drops that have waited
+    ALERT_DIGEST_WINDOW seconds into one message. Pending drops live in the
+    outbox table, so a restart of either process loses none of them.
+    """
+
+    def __init__(self, digest: bool = Config.ALERT_DIGEST):
+        self.digest = digest
+        self.outbox_repository = AlertOutboxRepository()
+
+    async def send_alert(self, item: TrackedItem, current_price: float, user_id: int) -> None:
         try:
-            message = PriceAlert.format_message(item, current_price)
-            await bot.send_message(
-                user_id,
-                message,
-                parse_mode=ParseMode.MARKDOWN
-            )
-            logger.info(f"Sent price alert to user {user_id} for item {item.name}")
+            message = format_message(item, current_price)
+            entry = format_digest_entry(item, current_price) if self.digest else None
+            self._enqueue(user_id, message, entry)
+            logger.info(f"Queued price alert to user {user_id} for item {item.name}")
         except Exception as e:
-            logger.error(f"Failed to send price alert to user {user_id}: {e}")
+            logger.error(f"Failed to queue price alert to user {user_id}: {e}")
+
+    def _enqueue(self, user_id: int, message: str, digest_entry: Optional[str]) -> None:
+        """Write an alert for one chat to the outbox."""
+        with get_db() as db:
+            self.outbox_repository.add_many(db, [{
+                "chat_id": user_id,
+                "text": message,
+                "parse_mode": ParseMode.MARKDOWN.value,
+                "digest_entry": digest_entry,
+            }])
 
 class PriceChecker:
     """Handles price checking and updates for tracked items."""
     
     def __init__(self):
-        self.user_repository = UserRepository()
         self.tracked_item_repository = TrackedItemRepository()
+        self.results = CheckResultBuffer()
+        self.alerts = PriceAlert()
+        self._semaphore = asyncio.Semaphore(Config.CHECK_CONCURRENCY)
+        self._domain_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Items of the current batch whose result has already been queued
+        self._settled: Set[int] = set()
     
-    async def check_all_prices(self) -> None:
-        """Check prices for all users' tracked items."""
-        logger.info("Starting price check for all users")
+    async def check_due_prices(self, limit: int) -> int:
+        """Check prices for up to `limit` items whose next check is due.
+
+        Returns:
+            Number of items checked
+        """
         try:
+            started = time.perf_counter()
+            now = datetime.datetime.now(datetime.timezone.utc)
+            lease_until = now + datetime.timedelta(seconds=Config.CHECK_LEASE_SECONDS)
+
+            # Claim in a transaction of its own so the lease is visible to
+            # other workers, and no connection is held while scraping
             with get_db() as db:
-                users = self.user_repository.get_all(db)
-                for user in users:
-                    await self._process_user_items(user, db)
-            logger.info("Completed price check for all users")
+                items = self.tracked_item_repository.claim_due(
+                    db,
+                    now=now,
+                    limit=limit,
+                    worker_id=Config.WORKER_ID,
+                    lease_until=lease_until
+                )
+            if not items:
+                return 0
+
+            self._settled = set()
+            watchers_by_link = self._group_by_link(items)
+            tasks = {
+                asyncio.ensure_future(self._check_with_limits(link, watchers_by_link[link])): link
+                for link in self._interleave_by_domain(watchers_by_link)
+            }
+            try:
+                done, pending = await asyncio.wait(tasks, timeout=Config.CHECK_CYCLE_TIMEOUT)
+                for task in done:
+                    if task.exception():
+                        logger.error(f"Error checking link {tasks[task]}: {task.exception()}")
+                if pending:
+                    await self._abandon(pending, tasks, watchers_by_link)
+            finally:
+                self.results.flush()
+
+            elapsed = time.perf_counter() - started
+            rate = len(items) / elapsed if elapsed > 0 else 0.0
+            logger.info(
+                f"Checked {len(items)} due items "
+                f"({len(watchers_by_link)} distinct links) "
+                f"in {elapsed:.2f}s ({rate:.2f} items/s)"
+            )
+            logger.info(
+                f"Scraper stats: {scraper.stats.snapshot()}, fingerprint hit rate "
+                f"{scraper.stats.hit_rate('fingerprint_hits', 'fingerprint_misses'):.0%}"
+            )
+            logger.info(f"Per-domain request rates: {domain_scheduler.snapshot()}")
+            unhealthy = domain_health.unhealthy()
+            if unhealthy:
+                logger.warning(f"Unhealthy domains: {unhealthy}")
+            timeouts = domain_health.timeouts()
+            if timeouts:
+                logger.warning(f"Scrape timeouts by domain: {timeouts}")
+            return len(items)
         except Exception as e:
             logger.error(f"Error in price check: {e}")
+            return 0
+
+    async def _abandon(self, pending, tasks: Dict[asyncio.Future, str],
+                       watchers_by_link: Dict[str, List[Row]]) -> None:
+        """
+        Cancel checks still running at the cycle deadline and release their
+        unfinished items, so they are claimed again next cycle instead of
+        waiting for the lease to expire. Watchers already updated (and
+        possibly alerted) before the deadline keep their result.
+        """
+        logger.warning(
+            f"Check cycle hit its {Config.CHECK_CYCLE_TIMEOUT}s deadline, "
+            f"abandoning {len(pending)} links"
+        )
+        for task in pending:
+            task.cancel()
+        await asyncio.wait(pending)
+        for task in pending:
+            domain_health.cancel_trial(tasks[task])
+            for item in watchers_by_link[tasks[task]]:
+                if item.id not in self._settled:
+                    self._defer_item(item, 0)
+
+    @staticmethod
+    def _group_by_link(items: List[Row]) -> Dict[str, List[Row]]:
+        """
+        Group tracked items by canonical product link so each product is
+        scraped once, however its watchers pasted the link.
+        """
+        watchers_by_link: Dict[str, List[Row]] = {}
+        for item in items:
+            watchers_by_link.setdefault(item.canonical_link, []).append(item)
+        return watchers_by_link
+
+    @staticmethod
+    def _interleave_by_domain(links) -> List[str]:
+        """
+        Order links round-robin across domains, so a batch dominated by one
+        shop does not fill every check slot with requests waiting on that
+        shop's rate limit while other shops sit idle.
+        """
+        by_domain: Dict[str, List[str]] = {}
+        for link in links:
+            by_domain.setdefault(get_domain(link), []).append(link)
+        rounds = itertools.zip_longest(*by_domain.values())
+        return [link for round_ in rounds for link in round_ if link is not None]
+
+    def _domain_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Return the semaphore capping concurrent checks against a domain."""
+        domain = get_domain(url)
+        if domain not in self._domain_semaphores:
+            self._domain_semaphores[domain] = asyncio.Semaphore(Config.CHECK_DOMAIN_CONCURRENCY)
+        return self._domain_semaphores[domain]
+
+    async def _check_with_limits(self, link: str, watchers: List[Row]) -> None:
+        """
+        Check a link while holding both the per-domain and global slots,
+        unless its domain's circuit is open, in which case its items are
+        deferred without taking a slot.
+        """
+        if not domain_health.allow(link):
+            delay = max(domain_health.retry_in(link), Config.MIN_CHECK_INTERVAL)
+            logger.info(f"Circuit open for {get_domain(link)}, deferring {link} by {delay:.0f}s")
+            for item in watchers:
+                self._defer_item(item, delay)
+            return
+        try:
+            async with self._domain_semaphore(link):
+                async with self._semaphore:
+                    await self._check_link_price(link, watchers)
+        finally:
+            # Frees a half-open trial if the scrape ended without a fetch
+            domain_health.cancel_trial(link)
 
-    async def _process_user_items(self, user: User, db) -> None:
-        """Process all tracked items for a specific user."""
+    async def _check_link_price(self, link: str, watchers: List[Row]) -> None:
+        """Scrape a link once and evaluate every item watching it."""
+        # The scraper records the fetch outcome for the link's circuit
         try:
-            items = self.tracked_item_repository.get_by_user_id(db, user.id)
-            for item in items:
-                await self._check_item_price(item, user.id, db)
+            latest_data = await scraper.scrape(url=link, last_price=watchers[0].current_price)
         except Exception as e:
-            logger.error(f"Error processing items for user {user.id}: {e}")
+            logger.error(f"Error scraping link {link}: {e}")
+            for item in watchers:
+                self._update_timestamps(item)
+            return
 
-    async def _check_item_price(self, item: TrackedItem, user_id: int, db) -> None:
-        """Check and update price for a single item."""
+        for item in watchers:
+            await self._check_item_price(item, latest_data)
+
+    async def _check_item_price(self, item: Row, latest_data: dict) -> None:
+        """Check and update price for a single item against scraped data."""
         try:
-            latest_data = await scraper.scrape(url=item.link)
             if not latest_data["is_trackable"]:
                 logger.warning(f"Item {item.name} is no longer trackable")
+                self._update_timestamps(item)
                 return
 
             current_price = float(latest_data["price"])
-            if current_price < item.target_price:
+            is_drop = current_price < item.target_price
+            if is_drop:
                 logger.info(
                     f"Price drop detected for {item.name}: "
                     f"{item.current_price} -> {current_price}"
                 )
-                
-                # Update item
-                self._update_item(item, current_price, db)
-                
+
+            # Update item
+            self._update_item(item, current_price)
+
+            if is_drop:
                 # Send alert
-                await PriceAlert.send_alert(item, current_price, user_id)
-            else:
-                # Just update timestamps
-                self._update_timestamps(item, db)
+                await self.alerts.send_alert(item, current_price, item.user_id)
 
         except Exception as e:
             logger.error(f"Error checking price for item {item.name}: {e}")
+            self._update_timestamps(item)
 
-    def _update_item(self, item: TrackedItem, new_price: float, db) -> None:
-        """Update item price and timestamps."""
-        try:
-            now = datetime.datetime.now(datetime.timezone.utc)
-            item.current_price = new_price
-            item.last_checked_at = now
-            item.updated_at = now
-            db.add(item)
-        except Exception as e:
-            logger.error(f"Error updating item {item.name}: {e}")
+    @staticmethod
+    def _adapt_interval(interval: int, changed: bool) -> int:
+        """
+        Shrink the check interval after a price change and back off
+        exponentially while the price stays stable, within the configured bounds.
+        """
+        if changed:
+            interval = interval / Config.CHECK_BACKOFF_FACTOR
+        else:
+            interval = interval * Config.CHECK_BACKOFF_FACTOR
+        return int(min(max(interval, Config.MIN_CHECK_INTERVAL), Config.MAX_CHECK_INTERVAL))
 
-    def _update_timestamps(self, item: TrackedItem, db) -> None:
-        """Update only item timestamps."""
-        try:
-            now = datetime.datetime.now(datetime.timezone.utc)
-            item.last_checked_at = now
-            item.updated_at = now
-            db.add(item)
-        except Exception as e:
-            logger.error(f"Error updating timestamps for item {item.name}: {e}")
+    def _update_item(self, item: Row, new_price: float) -> None:
+        """Queue an update of item price, check interval and timestamps."""
+        changed = new_price != item.current_price
+        if changed:
+            logger.info(f"Price of {item.name} changed: {item.current_price} -> {new_price}")
+        check_interval = self._adapt_interval(item.check_interval, changed)
+        values = self._checked_values(check_interval)
+        self._queue_result({
+            **values,
+            "id": item.id,
+            "current_price": new_price,
+            "check_interval": check_interval,
+        })
+        self.results.add_observation(item.id, new_price, values["last_checked_at"])
+
+    def _update_timestamps(self, item: Row) -> None:
+        """
+        Queue an update of only item timestamps, keeping price and check
+        interval. Same columns as _update_item, so both batch together.
+        """
+        self._queue_result({
+            **self._checked_values(item.check_interval),
+            "id": item.id,
+            "current_price": item.current_price,
+            "check_interval": item.check_interval,
+        })
+
+    def _defer_item(self, item: Row, delay: float) -> None:
+        """Queue an unchecked item to be retried after `delay` seconds."""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self._queue_result({
+            "id": item.id,
+            "next_check_at": now + datetime.timedelta(seconds=delay),
+            "updated_at": now,
+            "leased_by": None,
+            "leased_until": None,
+        })
+
+    def _queue_result(self, values: dict) -> None:
+        """Buffer an item's write-back and mark it settled for this batch."""
+        self.results.add(values)
+        self._settled.add(values["id"])
+
+    @staticmethod
+    def _checked_values(check_interval: int) -> dict:
+        """
+        Timestamps for an item checked now, with its lease released so any
+        worker can claim it when it is next due.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return {
+            "last_checked_at": now,
+            "next_check_at": now + datetime.timedelta(seconds=check_interval),
+            "updated_at": now,
+            "leased_by": None,
+            "leased_until": None,
+        }
 
 # Create singleton instance
 price_checker = PriceChecker()
 
 # Main function to be called by the scheduler
-async def check_price_drops() -> None:
-    """Main entry point for price checking."""
+async def check_price_drops(limit: int = Config.CHECK_BATCH_SIZE) -> int:
+    """Main entry point for price checking. Returns the number of items checked."""
     try:
-        await price_checker.check_all_prices()
+        return await price_checker.check_due_prices(limit)
     except Exception as e:
         logger.error(f"Error in check_price_drops: {e}")
+        return 0
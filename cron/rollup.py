@@ -0,0 +1,63 @@
+import asyncio
+import datetime
+from config import Config
+from db.core import get_db
+from db.models.price_rollup import PriceRollup
+from db.repositories.price_history import PriceHistoryRepository
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class PriceHistoryRollup:
+    """
+    Background job that rolls raw price observations up into hourly and
+    daily buckets and enforces retention on all three levels.
+
+    Buckets are recomputed with upserts, so running the job twice (or in
+    several processes) is harmless.
+    """
+
+    def __init__(self):
+        self.repository = PriceHistoryRepository()
+
+    def run_once(self) -> None:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        current_hour = now.replace(minute=0, second=0, microsecond=0)
+        current_day = current_hour.replace(hour=0)
+
+        # Recompute everything still covered by raw data; it is cheap
+        # thanks to the BRIN index and makes missed runs self-healing
+        raw_cutoff = current_hour - datetime.timedelta(days=Config.PRICE_RAW_RETENTION_DAYS)
+        hourly_cutoff = current_day - datetime.timedelta(days=Config.PRICE_HOURLY_RETENTION_DAYS)
+        daily_cutoff = current_day - datetime.timedelta(days=Config.PRICE_DAILY_RETENTION_DAYS)
+
+        with get_db() as db:
+            hourly = self.repository.rollup_hourly(db, since=raw_cutoff, until=current_hour)
+            daily = self.repository.rollup_daily(
+                db,
+                since=max(raw_cutoff.replace(hour=0), hourly_cutoff),
+                until=current_day
+            )
+            purged_raw = self.repository.purge_observations(db, before=raw_cutoff)
+            purged_hourly = self.repository.purge_rollups(
+                db, bucket_seconds=PriceRollup.HOURLY, before=hourly_cutoff
+            )
+            purged_daily = self.repository.purge_rollups(
+                db, bucket_seconds=PriceRollup.DAILY, before=daily_cutoff
+            )
+
+        logger.info(
+            f"Price history rollup: {hourly} hourly and {daily} daily buckets upserted, "
+            f"purged {purged_raw} raw, {purged_hourly} hourly and {purged_daily} daily rows"
+        )
+
+    async def run(self) -> None:
+        """Run the rollup job forever."""
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"Error in price history rollup: {e}")
+            await asyncio.sleep(Config.PRICE_ROLLUP_INTERVAL)
+
+price_history_rollup = PriceHistoryRollup()
@@ -0,0 +1,39 @@
+import asyncio
+import time
+from config import Config
+from utils.logger import get_logger
+from .price_checker import check_price_drops
+
+logger = get_logger(__name__)
+
+class PriceCheckScheduler:
+    """
+    Continuously pulls items whose next check is due and paces them so the
+    check rate stays close to Config.CHECK_RATE items per second.
+    """
+
+    def __init__(self, batch_size: int = Config.CHECK_BATCH_SIZE, rate: float = Config.CHECK_RATE):
+        self.batch_size = batch_size
+        self.rate = rate
+
+    async def run(self) -> None:
+        """Run the scheduling loop forever."""
+        while True:
+            try:
+                started = time.perf_counter()
+                checked = await check_price_drops(self.batch_size)
+                if not checked:
+                    await asyncio.sleep(Config.CRON_INTERVAL)
+                    continue
+
+                # Spread batches out so load stays flat instead of bursting
+                budget = checked / self.rate
+                elapsed = time.perf_counter() - started
+                if budget > elapsed:
+                    await asyncio.sleep(budget - elapsed)
+            except Exception as e:
+                logger.error(f"Error in price check scheduler: {e}")
+                # Sleep a bit before retrying after error
+                await asyncio.sleep(60)
+
+price_check_scheduler = PriceCheckScheduler()
@@ -0,0 +1,74 @@
+import datetime
+import time
+from typing import Any, Dict, List
+from config import Config
+from db.core import get_db
+from db.repositories.price_history import PriceHistoryRepository
+from db.repositories.tracked_item import TrackedItemRepository
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class CheckResultBuffer:
+    """
+    Buffers per-item check results and observed prices and writes them
+    back in bulk (UPDATEs and price history INSERTs), each flush in a short
+    transaction of its own.
+    """
+
+    def __init__(self, flush_size: int = Config.CHECK_FLUSH_SIZE,
+                 flush_interval: float = Config.CHECK_FLUSH_INTERVAL):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.repository = TrackedItemRepository()
+        self.history_repository = PriceHistoryRepository()
+        self._pending: List[Dict[str, Any]] = []
+        self._observations: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+
+    def add(self, values: Dict[str, Any]) -> None:
+        """Queue an update for one item. `values` must include its "id"."""
+        self._pending.append(values)
+        self._maybe_flush()
+
+    def add_observation(self, tracked_item_id: int, price: float,
+                        observed_at: datetime.datetime) -> None:
+        """Queue a price history point for one item."""
+        self._observations.append({
+            "tracked_item_id": tracked_item_id,
+            "observed_at": observed_at,
+            "price": price,
+        })
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if (
+            len(self._pending) + len(self._observations) >= self.flush_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered results to the database."""
+        self._last_flush = time.monotonic()
+        if not self._pending and not self._observations:
+            return
+
+        values, self._pending = self._pending, []
+        observations, self._observations = self._observations, []
+        try:
+            with get_db() as db:
+                if values:
+                    self.repository.bulk_update(db, values)
+                if observations:
+                    self.history_repository.add_observations(db, observations)
+            logger.info(
+                f"Wrote back {len(values)} check results "
+                f"and {len(observations)} price observations"
+            )
+        except Exception as e:
+            # Leases on these items expire and they get checked again
+            logger.error(
+                f"Failed to write back {len(values)} check results "
+                f"and {len(observations)} price observations: {e}"
+            )
@@ -1,2 +1,5 @@
 from .user import User
 from .tracked_item import TrackedItem
+from .price_observation import PriceObservation
+from .price_rollup import PriceRollup
+from .alert_outbox import AlertOutbox
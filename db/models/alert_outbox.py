@@ -0,0 +1,35 @@
+import datetime
+from typing import Optional
+from sqlalchemy import BigInteger, String, Text, ForeignKey, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from db.base import Base
+
+class AlertOutbox(Base):
+    """
+    An alert written by a checker process, waiting for the bot process to
+    deliver it. Rows are leased while being delivered and deleted once done.
+    """
+    __tablename__ = "alert_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    chat_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    parse_mode: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Set for alerts to be combined with the chat's other drops into a digest
+    digest_entry: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
+
+    # Delivery leasing
+    claimed_by: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    claimed_until: Mapped[Optional[datetime.datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
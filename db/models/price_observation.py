@@ -0,0 +1,20 @@
+import datetime
+from sqlalchemy import Integer, Float, ForeignKey, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from db.base import Base
+
+class PriceObservation(Base):
+    """A single price seen by the checker. Append-only raw history."""
+    __tablename__ = "price_observations"
+    __table_args__ = (
+        # Rows arrive in time order, so a BRIN index stays tiny
+        Index("ix_price_observations_observed_at", "observed_at", postgresql_using="brin"),
+    )
+
+    tracked_item_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("tracked_items.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    observed_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    price: Mapped[float] = mapped_column(Float(precision=24), nullable=False)
@@ -0,0 +1,27 @@
+import datetime
+from sqlalchemy import Integer, Float, ForeignKey, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from db.base import Base
+
+class PriceRollup(Base):
+    """Price history aggregated into fixed-size time buckets (hourly, daily)."""
+    __tablename__ = "price_rollups"
+    __table_args__ = (
+        Index("ix_price_rollups_bucket_start", "bucket_start", postgresql_using="brin"),
+    )
+
+    HOURLY = 3600
+    DAILY = 86400
+
+    tracked_item_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("tracked_items.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    bucket_seconds: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bucket_start: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+
+    min_price: Mapped[float] = mapped_column(Float(precision=24), nullable=False)
+    max_price: Mapped[float] = mapped_column(Float(precision=24), nullable=False)
+    avg_price: Mapped[float] = mapped_column(Float(precision=24), nullable=False)
+    samples: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -1,11 +1,16 @@
 import datetime
-from sqlalchemy import BigInteger, Integer, String, Float, ForeignKey, DateTime
+from typing import Optional
+from sqlalchemy import BigInteger, Integer, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from db.base import Base
 
 class TrackedItem(Base):
     """Model representing a tracked item in the price tracking system."""
     __tablename__ = "tracked_items"
+    __table_args__ = (
+        # Serves the scheduler's due-item scan in (next_check_at, id) order
+        Index("ix_tracked_items_next_check_at_id", "next_check_at", "id"),
+    )
 
     # Primary key and relationships
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, index=True)
@@ -22,6 +27,9 @@ class TrackedItem(Base):
     target_price: Mapped[float] = mapped_column(Float, nullable=False)
     currency: Mapped[str] = mapped_column(String(3), nullable=False)
     link: Mapped[str] = mapped_column(String, nullable=False)
+    # The link with tracking parameters and other noise removed, shared by
+    # every item on the same product
+    canonical_link: Mapped[str] = mapped_column(String, nullable=False, index=True)
 
     # Timestamps
     updated_at: Mapped[datetime.datetime] = mapped_column(
@@ -35,6 +43,21 @@ class TrackedItem(Base):
         default=datetime.datetime.now(datetime.timezone.utc)
     )
 
+    # Scheduling
+    next_check_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
+    check_interval: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Worker leasing
+    leased_by: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    leased_until: Mapped[Optional[datetime.datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
+
     # Relationships
     user = relationship("User", back_populates="tracked_items", cascade="all, delete")
 
@@ -0,0 +1,79 @@
+import datetime
+from typing import Any, Dict, List
+from sqlalchemy import Row, select, delete, update, insert, or_, func
+from sqlalchemy.orm import Session
+from db.models.alert_outbox import AlertOutbox
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class AlertOutboxRepository:
+    @staticmethod
+    def add_many(db: Session, messages: List[Dict[str, Any]]) -> None:
+        """
+        Queue alerts, each with chat_id, text and parse_mode, for delivery.
+        Alerts meant for a digest also carry their digest_entry.
+        """
+        try:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            db.execute(insert(AlertOutbox), [{**message, "created_at": now} for message in messages])
+        except Exception as e:
+            logger.error(f"Error adding {len(messages)} alerts to the outbox: {str(e)}")
+            raise
+
+    @staticmethod
+    def claim(db: Session, *, now: datetime.datetime, limit: int, worker_id: str,
+              lease_until: datetime.datetime, digest_before: datetime.datetime) -> List[Row]:
+        """
+        Lease up to `limit` undelivered alerts, oldest first, to `worker_id`.
+        Alerts leased by a delivery process that died are claimable again
+        once their lease expires.
+
+        Digest alerts are held back until the chat's oldest one was written
+        before `digest_before`, then all of that chat's are claimed together.
+        """
+        try:
+            unclaimed = or_(AlertOutbox.claimed_until.is_(None), AlertOutbox.claimed_until <= now)
+            due_digests = (
+                select(AlertOutbox.chat_id)
+                .where(AlertOutbox.digest_entry.is_not(None), unclaimed)
+                .group_by(AlertOutbox.chat_id)
+                .having(func.min(AlertOutbox.created_at) <= digest_before)
+            )
+            claimable = (
+                select(AlertOutbox.id)
+                .where(
+                    unclaimed,
+                    or_(AlertOutbox.digest_entry.is_(None), AlertOutbox.chat_id.in_(due_digests))
+                )
+                .order_by(AlertOutbox.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            stmt = (
+                update(AlertOutbox)
+                .where(AlertOutbox.id.in_(claimable.scalar_subquery()))
+                .values(claimed_by=worker_id, claimed_until=lease_until)
+                .returning(
+                    AlertOutbox.id,
+                    AlertOutbox.chat_id,
+                    AlertOutbox.text,
+                    AlertOutbox.parse_mode,
+                    AlertOutbox.digest_entry
+                )
+                .execution_options(synchronize_session=False)
+            )
+            return sorted(db.execute(stmt), key=lambda row: row.id)
+        except Exception as e:
+            logger.error(f"Error claiming outbox alerts for {worker_id}: {str(e)}")
+            raise
+
+    @staticmethod
+    def delete_many(db: Session, alert_ids: List[int]) -> int:
+        """Remove alerts that have been delivered or given up on."""
+        try:
+            stmt = delete(AlertOutbox).where(AlertOutbox.id.in_(alert_ids))
+            return db.execute(stmt).rowcount
+        except Exception as e:
+            logger.error(f"Error deleting {len(alert_ids)} outbox alerts: {str(e)}")
+            raise
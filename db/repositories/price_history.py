@@ -0,0 +1,113 @@
+import datetime
+from typing import Any, Dict, List
+from sqlalchemy import select, delete, func, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from db.models.price_observation import PriceObservation
+from db.models.price_rollup import PriceRollup
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class PriceHistoryRepository:
+    @staticmethod
+    def add_observations(db: Session, observations: List[Dict[str, Any]]) -> None:
+        """Append raw observations, each with tracked_item_id, observed_at and price."""
+        try:
+            stmt = insert(PriceObservation).on_conflict_do_nothing()
+            db.execute(stmt, observations)
+        except Exception as e:
+            logger.error(f"Error adding {len(observations)} price observations: {str(e)}")
+            raise
+
+    @staticmethod
+    def _upsert_rollups(db: Session, rows) -> int:
+        stmt = insert(PriceRollup).from_select(
+            ["tracked_item_id", "bucket_seconds", "bucket_start",
+             "min_price", "max_price", "avg_price", "samples"],
+            rows
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["tracked_item_id", "bucket_seconds", "bucket_start"],
+            set_={
+                "min_price": stmt.excluded.min_price,
+                "max_price": stmt.excluded.max_price,
+                "avg_price": stmt.excluded.avg_price,
+                "samples": stmt.excluded.samples,
+            }
+        )
+        return db.execute(stmt).rowcount
+
+    @staticmethod
+    def rollup_hourly(db: Session, *, since: datetime.datetime, until: datetime.datetime) -> int:
+        """(Re)compute hourly buckets from raw observations in [since, until)."""
+        try:
+            bucket = func.date_trunc("hour", PriceObservation.observed_at)
+            rows = (
+                select(
+                    PriceObservation.tracked_item_id,
+                    literal(PriceRollup.HOURLY),
+                    bucket,
+                    func.min(PriceObservation.price),
+                    func.max(PriceObservation.price),
+                    func.avg(PriceObservation.price),
+                    func.count()
+                )
+                .where(
+                    PriceObservation.observed_at >= since,
+                    PriceObservation.observed_at < until
+                )
+                .group_by(PriceObservation.tracked_item_id, bucket)
+            )
+            return PriceHistoryRepository._upsert_rollups(db, rows)
+        except Exception as e:
+            logger.error(f"Error rolling up hourly prices: {str(e)}")
+            raise
+
+    @staticmethod
+    def rollup_daily(db: Session, *, since: datetime.datetime, until: datetime.datetime) -> int:
+        """(Re)compute daily buckets from hourly buckets in [since, until)."""
+        try:
+            bucket = func.date_trunc("day", PriceRollup.bucket_start)
+            rows = (
+                select(
+                    PriceRollup.tracked_item_id,
+                    literal(PriceRollup.DAILY),
+                    bucket,
+                    func.min(PriceRollup.min_price),
+                    func.max(PriceRollup.max_price),
+                    func.sum(PriceRollup.avg_price * PriceRollup.samples) / func.sum(PriceRollup.samples),
+                    func.sum(PriceRollup.samples)
+                )
+                .where(
+                    PriceRollup.bucket_seconds == PriceRollup.HOURLY,
+                    PriceRollup.bucket_start >= since,
+                    PriceRollup.bucket_start < until
+                )
+                .group_by(PriceRollup.tracked_item_id, bucket)
+            )
+            return PriceHistoryRepository._upsert_rollups(db, rows)
+        except Exception as e:
+            logger.error(f"Error rolling up daily prices: {str(e)}")
+            raise
+
+    @staticmethod
+    def purge_observations(db: Session, before: datetime.datetime) -> int:
+        try:
+            stmt = delete(PriceObservation).where(PriceObservation.observed_at < before)
+            return db.execute(stmt).rowcount
+        except Exception as e:
+            logger.error(f"Error purging price observations: {str(e)}")
+            raise
+
+    @staticmethod
+    def purge_rollups(db: Session, *, bucket_seconds: int, before: datetime.datetime) -> int:
+        try:
+            stmt = delete(PriceRollup).where(
+                PriceRollup.bucket_seconds == bucket_seconds,
+                PriceRollup.bucket_start < before
+            )
+            return db.execute(stmt).rowcount
+        except Exception as e:
+            logger.error(f"Error purging {bucket_seconds}s price rollups: {str(e)}")
+            raise
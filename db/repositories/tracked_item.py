@@ -1,5 +1,6 @@
-from typing import List
-from sqlalchemy import select, delete
+import datetime
+from typing import Dict, List, Any
+from sqlalchemy import Row, select, delete, update, or_, func
 from sqlalchemy.orm import Session
 from db.models.tracked_item import TrackedItem
 from utils.logger import get_logger
@@ -18,16 +19,88 @@ class TrackedItemRepository:
             raise
 
     @staticmethod
-    def create(db: Session, *, user_id: int, name: str, link: str,
+    def count_by_user_id(db: Session, user_id: int) -> int:
+        try:
+            stmt = select(func.count()).select_from(TrackedItem).where(TrackedItem.user_id == user_id)
+            return db.scalar(stmt)
+        except Exception as e:
+            logger.error(f"Error counting items for user {user_id}: {str(e)}")
+            raise
+
+    @staticmethod
+    def claim_due(db: Session, *, now: datetime.datetime, limit: int,
+                  worker_id: str, lease_until: datetime.datetime) -> List[Row]:
+        """
+        Lease up to `limit` due items to `worker_id` and return the columns
+        the checker needs as plain rows, so no session has to stay open.
+        Rows locked by a concurrent claim are skipped, and rows whose lease
+        has expired (e.g. the holder crashed) are claimable again.
+        """
+        try:
+            due = (
+                select(TrackedItem.id)
+                .where(
+                    TrackedItem.next_check_at <= now,
+                    or_(TrackedItem.leased_until.is_(None), TrackedItem.leased_until <= now)
+                )
+                .order_by(TrackedItem.next_check_at, TrackedItem.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            stmt = (
+                update(TrackedItem)
+                .where(TrackedItem.id.in_(due.scalar_subquery()))
+                .values(leased_by=worker_id, leased_until=lease_until)
+                .returning(
+                    TrackedItem.id,
+                    TrackedItem.user_id,
+                    TrackedItem.name,
+                    TrackedItem.link,
+                    TrackedItem.canonical_link,
+                    TrackedItem.currency,
+                    TrackedItem.current_price,
+                    TrackedItem.target_price,
+                    TrackedItem.check_interval
+                )
+                .execution_options(synchronize_session=False)
+            )
+            return list(db.execute(stmt))
+        except Exception as e:
+            logger.error(f"Error claiming due items for worker {worker_id}: {str(e)}")
+            raise
+
+    @staticmethod
+    def bulk_update(db: Session, values: List[Dict[str, Any]]) -> None:
+        """
+        Apply many per-item updates, each keyed by its "id". SQLAlchemy only
+        batches rows that set the same columns into one executemany, so rows
+        are grouped by their key set first.
+        """
+        try:
+            groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+            for row in values:
+                groups.setdefault(frozenset(row), []).append(row)
+            for rows in groups.values():
+                db.execute(update(TrackedItem), rows)
+        except Exception as e:
+            logger.error(f"Error bulk updating {len(values)} items: {str(e)}")
+            raise
+
+    @staticmethod
+    def create(db: Session, *, user_id: int, name: str, link: str, canonical_link: str,
                current_price: float, target_price: float, currency: str) -> TrackedItem:
         try:
+            now = datetime.datetime.now(datetime.timezone.utc)
             item = TrackedItem(
                 user_id=user_id,
                 name=name,
                 link=link,
+                canonical_link=canonical_link,
                 current_price=current_price,
                 target_price=target_price,
-                currency=currency
+                currency=currency,
+                check_interval=Config.CHECK_INTERVAL,
+                next_check_at=now + datetime.timedelta(seconds=Config.CHECK_INTERVAL)
             )
             db.add(item)
             return item
@@ -63,7 +136,6 @@ class TrackedItemService:
         self.repository = TrackedItemRepository()
 
     async def check_tracking_limit(self, db: Session, user_id: int) -> bool:
-        items = self.repository.get_by_user_id(db, user_id)
-        return len(items) < Config.MAX_ITEM_LIMIT
+        return self.repository.count_by_user_id(db, user_id) < Config.MAX_ITEM_LIMIT
 
 tracked_item_service = TrackedItemService()
@@ -1,3 +1,4 @@
+from typing import Dict, Optional, Tuple
 from aiogram import F, Router
 from aiogram.filters import Command
 from aiogram.types import Message, CallbackQuery, ErrorEvent
@@ -6,6 +7,7 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.fsm.state import State, StatesGroup
 from db.core import get_db
 from db.repositories.tracked_item import tracked_item_service
+from scraper.canonical import canonicalize_url
 from scraper.scraper import scraper
 from utils.logger import get_logger
 import validators
@@ -111,6 +113,30 @@ async def command_track_handler(message: Message, state: FSMContext) -> None:
         logger.error(f"Error in track command for user {user_id}: {str(e)}")
         await message.answer(TrackMessages.ERROR)
 
+async def resolve_link(link: str) -> Tuple[str, Dict[str, Optional[str]]]:
+    """
+    Scrape the link as pasted and pick the link to check it by. The
+    canonical form is only used once scraping it shows the same product;
+    otherwise the pasted link is kept, so a canonicalization rule that does
+    not fit a shop cannot point the item at a different page.
+
+    Returns:
+        The link to store as the item's canonical link, and the product details
+    """
+    product_details = await scraper.scrape(url=link)
+    canonical_link = canonicalize_url(link)
+    if canonical_link == link or not product_details or not product_details["is_trackable"]:
+        return link, product_details
+
+    canonical_details = await scraper.scrape(url=canonical_link)
+    if all(
+        canonical_details.get(key) == product_details[key]
+        for key in ("is_trackable", "product_name", "price", "currency")
+    ):
+        return canonical_link, product_details
+    logger.warning(f"Canonical link {canonical_link} shows a different page than {link}, keeping the latter")
+    return link, product_details
+
 @track_item_router.message(TrackStates.product_link)
 async def link_received_handler(message: Message, state: FSMContext) -> None:
     """Handle product link input."""
@@ -123,7 +149,7 @@ async def link_received_handler(message: Message, state: FSMContext) -> None:
 
     try:
         processing_msg = await message.answer(TrackMessages.PROCESSING)
-        product_details = await scraper.scrape(url=message.text)
+        canonical_link, product_details = await resolve_link(message.text)
 
         if not product_details or not product_details['is_trackable']:
             await processing_msg.edit_text(TrackMessages.CANNOT_TRACK)
@@ -135,6 +161,7 @@ async def link_received_handler(message: Message, state: FSMContext) -> None:
 
         await state.update_data(
             product_link=message.text,
+            canonical_link=canonical_link,
             product_name=product_details["product_name"],
             current_price=product_details["price"],
             currency=product_details["currency"],
@@ -191,6 +218,7 @@ async def confirm_handler(callback: CallbackQuery, state: FSMContext) -> None:
                 user_id=user_id,
                 name=data["product_name"],
                 link=data["product_link"],
+                canonical_link=data["canonical_link"],
                 current_price=data["current_price"],
                 target_price=data["target_price"],
                 currency=data["currency"]
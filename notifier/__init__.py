@@ -0,0 +1,10 @@
+def __getattr__(name):
+    # Loaded on first use, so price check workers can import
+    # notifier.messages without creating the Telegram bot
+    if name in ("AlertQueue", "alert_queue"):
+        from . import queue
+        return getattr(queue, name)
+    if name in ("AlertOutboxRelay", "alert_outbox_relay"):
+        from . import outbox
+        return getattr(outbox, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,69 @@
+import re
+from typing import List
+from db.models import TrackedItem
+
+# Telegram rejects messages longer than this
+MAX_MESSAGE_LENGTH = 4096
+# Item names are cut to this many characters in alerts
+MAX_NAME_LENGTH = 200
+
+def _clean_name(name: str) -> str:
+    """
+    Make an item name safe to put inside a Markdown entity: drop the
+    characters Markdown would treat as markup and cap its length.
+    """
+    name = " ".join(re.sub(r"[*_`\[\]]", "", name).split())
+    if len(name) > MAX_NAME_LENGTH:
+        name = name[:MAX_NAME_LENGTH - 1].rstrip() + "…"
+    return name
+
+def format_message(item: TrackedItem, current_price: float) -> str:
+    return (
+        f"🎉 Price Alert for *{_clean_name(item.name)}*!\n\n"
+        f"💰 Current Price: *{item.currency} {current_price}*\n"
+        f"🎯 Your Target Price: *{item.currency} {item.target_price}*\n\n"
+        f"🔗 Check it out here: [Link]({item.link})\n\n"
+        f"Act fast before it changes again!"
+    )
+
+def format_digest_entry(item: TrackedItem, current_price: float) -> str:
+    return (
+        f"*{_clean_name(item.name)}*\n"
+        f"💰 *{item.currency} {current_price}* (target {item.currency} {item.target_price})\n"
+        f"🔗 [Link]({item.link})"
+    )
+
+def _fit(entry: str, budget: int) -> str:
+    """
+    Shorten an entry to at most `budget` characters by dropping whole
+    lines from its end. Every line holds complete Markdown entities, so
+    the result is still valid Markdown.
+    """
+    kept = []
+    length = 0
+    for line in entry.split("\n"):
+        length += len(line) + (1 if kept else 0)
+        if length > budget:
+            break
+        kept.append(line)
+    return "\n".join(kept)
+
+def format_digest(entries: List[str]) -> List[str]:
+    """Join digest entries into as few messages as fit Telegram's length limit."""
+    header = "🎉 Price Alerts!\n\n"
+    footer = "\n\nAct fast before they change again!"
+    budget = MAX_MESSAGE_LENGTH - len(header) - len(footer)
+
+    messages = []
+    current = ""
+    for entry in entries:
+        if len(entry) > budget:
+            entry = _fit(entry, budget)
+        candidate = f"{current}\n\n{entry}" if current else entry
+        if len(candidate) > budget:
+            messages.append(header + current + footer)
+            candidate = entry
+        current = candidate
+    if current:
+        messages.append(header + current + footer)
+    return messages
@@ -0,0 +1,127 @@
+import asyncio
+import datetime
+from typing import Dict, List, Optional, Set
+from sqlalchemy import Row
+from config import Config
+from db.core import get_db
+from db.repositories.alert_outbox import AlertOutboxRepository
+from utils.logger import get_logger
+from .messages import format_digest
+from .queue import alert_queue
+
+logger = get_logger(__name__)
+
+class AlertOutboxRelay:
+    """
+    Runs in the bot process and moves alerts that checker processes wrote
+    to the outbox table into the alert queue. An alert's row is leased
+    while it is queued and deleted once it has been delivered or given up
+    on, so alerts survive a bot restart and are sent at least once.
+
+    Digest alerts for a chat are claimed together once the oldest has
+    waited ALERT_DIGEST_WINDOW seconds and sent as one combined message.
+    """
+
+    def __init__(self):
+        self.repository = AlertOutboxRepository()
+        # Alerts handed to the queue and not yet finished with
+        self._in_flight: Set[int] = set()
+        self._finished: List[int] = []
+
+    async def run(self) -> None:
+        logger.info("Starting alert outbox relay")
+        while True:
+            try:
+                relayed = await self.relay_once()
+            except Exception as e:
+                logger.error(f"Error relaying outbox alerts: {e}")
+                relayed = 0
+            if not relayed:
+                await asyncio.sleep(Config.ALERT_OUTBOX_POLL_INTERVAL)
+
+    async def relay_once(self) -> int:
+        """
+        Clear finished alerts from the outbox and queue newly claimed ones.
+
+        Returns:
+            Number of alerts queued
+        """
+        self._delete_finished()
+
+        # Claim no more than the queue can work through within the lease
+        limit = Config.ALERT_OUTBOX_BATCH - len(self._in_flight)
+        if limit <= 0:
+            return 0
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        lease_until = now + datetime.timedelta(seconds=Config.ALERT_OUTBOX_LEASE_SECONDS)
+        with get_db() as db:
+            alerts = self.repository.claim(
+                db,
+                now=now,
+                limit=limit,
+                worker_id=Config.WORKER_ID,
+                lease_until=lease_until,
+                digest_before=now - datetime.timedelta(seconds=Config.ALERT_DIGEST_WINDOW)
+            )
+
+        queued = 0
+        digests: Dict[int, List[Row]] = {}
+        for alert in alerts:
+            # A lease that ran out while the alert was still queued here
+            if alert.id in self._in_flight:
+                continue
+            if alert.digest_entry is not None:
+                digests.setdefault(alert.chat_id, []).append(alert)
+                continue
+            await self._send([alert.id], alert.chat_id, [alert.text], alert.parse_mode)
+            queued += 1
+
+        for chat_id, drops in digests.items():
+            if len(drops) == 1:
+                messages = [drops[0].text]
+            else:
+                messages = format_digest([drop.digest_entry for drop in drops])
+                logger.info(
+                    f"Combined {len(drops)} alerts to user {chat_id} "
+                    f"into {len(messages)} digest message(s)"
+                )
+            await self._send([drop.id for drop in drops], chat_id, messages, drops[0].parse_mode)
+            queued += len(drops)
+
+        if queued:
+            logger.info(f"Queued {queued} alerts from the outbox")
+        return queued
+
+    async def _send(self, alert_ids: List[int], chat_id: int, messages: List[str],
+                    parse_mode: Optional[str]) -> None:
+        """
+        Queue the messages made from some outbox alerts. The alerts are
+        finished with once every one of their messages is.
+        """
+        self._in_flight.update(alert_ids)
+        remaining = len(messages)
+
+        def on_done() -> None:
+            nonlocal remaining
+            remaining -= 1
+            if remaining == 0:
+                self._finished.extend(alert_ids)
+
+        for message in messages:
+            await alert_queue.send(chat_id, message, parse_mode=parse_mode, on_done=on_done)
+
+    def _delete_finished(self) -> None:
+        if not self._finished:
+            return
+        finished, self._finished = self._finished, []
+        try:
+            with get_db() as db:
+                self.repository.delete_many(db, finished)
+            self._in_flight.difference_update(finished)
+        except Exception:
+            # Retry on the next round; the alerts are already sent
+            self._finished.extend(finished)
+            raise
+
+alert_outbox_relay = AlertOutboxRelay()
@@ -0,0 +1,171 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Set
+from aiogram.exceptions import TelegramForbiddenError, TelegramBadRequest, TelegramRetryAfter
+from bot import bot
+from config import Config
+from utils.logger import get_logger
+from utils.rate_limit import TokenBucket
+
+logger = get_logger(__name__)
+
+@dataclass
+class OutgoingMessage:
+    chat_id: int
+    text: str
+    parse_mode: Optional[str] = None
+    attempts: int = 0
+    # Called once the message is delivered or given up on
+    on_done: Optional[Callable[[], None]] = None
+    # Whether a token from the chat's bucket was already taken for it
+    reserved: bool = False
+
+class AlertQueue:
+    """
+    Delivery queue in front of `bot.send_message`.
+
+    Messages are sent concurrently by a fixed set of sender tasks, each send
+    taking a token from a global bucket (Telegram allows ~30 msg/s per bot)
+    and from a per-chat bucket. A message for a chat that is being throttled
+    is set aside until the chat may be sent to again, so it never ties up a
+    sender. A 429 pauses the chat and the global bucket for `retry_after`
+    seconds and requeues the message instead of dropping it.
+    """
+
+    # Drop idle per-chat buckets once this many are tracked
+    MAX_CHAT_BUCKETS = 10000
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._senders: List[asyncio.Task] = []
+        self._global_bucket = TokenBucket(Config.ALERT_GLOBAL_RATE)
+        self._chat_buckets: Dict[int, TokenBucket] = {}
+        # Messages set aside, in order, until their chat may be sent to again
+        self._held: Dict[int, Deque[OutgoingMessage]] = {}
+        self._releasing: Set[asyncio.Task] = set()
+
+    def _ensure_started(self) -> None:
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._senders = [
+            asyncio.create_task(self._sender())
+            for _ in range(Config.ALERT_SENDERS)
+        ]
+        logger.info(f"Started alert queue with {len(self._senders)} senders")
+
+    async def send(self, chat_id: int, text: str, parse_mode: Optional[str] = None,
+                   on_done: Optional[Callable[[], None]] = None) -> None:
+        """
+        Queue a message for delivery. Returns as soon as it is queued;
+        `on_done` is called once it has been delivered or given up on.
+        """
+        self._ensure_started()
+        await self._queue.put(OutgoingMessage(chat_id, text, parse_mode, on_done=on_done))
+
+    @property
+    def backlog(self) -> int:
+        """Number of messages waiting to be sent."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def join(self) -> None:
+        """Wait until every queued message has been delivered or given up on."""
+        if self._queue is None:
+            return
+        while True:
+            await self._queue.join()
+            if not self._releasing:
+                return
+            await asyncio.gather(*self._releasing)
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        if chat_id not in self._chat_buckets:
+            if len(self._chat_buckets) >= self.MAX_CHAT_BUCKETS:
+                self._chat_buckets = {
+                    key: bucket for key, bucket in self._chat_buckets.items()
+                    if not bucket.idle
+                }
+            self._chat_buckets[chat_id] = TokenBucket(Config.ALERT_CHAT_RATE)
+        return self._chat_buckets[chat_id]
+
+    def _hold(self, message: OutgoingMessage, first: bool = False) -> None:
+        """Set a message aside until its chat's bucket hands out a token."""
+        held = self._held.get(message.chat_id)
+        if held is None:
+            held = self._held[message.chat_id] = deque()
+            task = asyncio.create_task(self._release(message.chat_id, held))
+            self._releasing.add(task)
+            task.add_done_callback(self._releasing.discard)
+        if first:
+            held.appendleft(message)
+        else:
+            held.append(message)
+
+    async def _release(self, chat_id: int, held: Deque[OutgoingMessage]) -> None:
+        """Requeue a chat's held messages one by one, each with a chat token taken."""
+        bucket = self._chat_bucket(chat_id)
+        while held:
+            await bucket.acquire()
+            message = held.popleft()
+            message.reserved = True
+            self._queue.put_nowait(message)
+        del self._held[chat_id]
+
+    async def _sender(self) -> None:
+        while True:
+            message = await self._queue.get()
+            try:
+                if await self._deliver(message) and message.on_done:
+                    message.on_done()
+            except Exception as e:
+                logger.error(f"Unexpected error delivering alert to {message.chat_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, message: OutgoingMessage) -> bool:
+        """
+        Try to send a message once.
+
+        Returns:
+            True if the message is done with, False if it was requeued
+        """
+        chat_bucket = self._chat_bucket(message.chat_id)
+        if not message.reserved:
+            if message.chat_id in self._held or chat_bucket.ready_in() > 0:
+                self._hold(message)
+                return False
+            await chat_bucket.acquire()
+        message.reserved = False
+        await self._global_bucket.acquire()
+
+        message.attempts += 1
+        try:
+            await bot.send_message(message.chat_id, message.text, parse_mode=message.parse_mode)
+            logger.info(f"Delivered alert to user {message.chat_id}")
+            return True
+        except TelegramRetryAfter as e:
+            logger.warning(
+                f"Rate limited sending to {message.chat_id}, retrying in {e.retry_after}s"
+            )
+            chat_bucket.pause(e.retry_after)
+            self._global_bucket.pause(e.retry_after)
+            self._hold(message, first=True)
+            return False
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            # The user blocked the bot or the message is malformed; retrying won't help
+            logger.error(f"Dropping alert to user {message.chat_id}: {e}")
+            return True
+        except Exception as e:
+            if message.attempts >= Config.ALERT_MAX_ATTEMPTS:
+                logger.error(
+                    f"Giving up on alert to user {message.chat_id} "
+                    f"after {message.attempts} attempts: {e}"
+                )
+                return True
+            logger.warning(f"Failed to send alert to user {message.chat_id}, retrying: {e}")
+            chat_bucket.pause(2 ** message.attempts)
+            self._hold(message, first=True)
+            return False
+
+alert_queue = AlertQueue()
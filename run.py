@@ -2,31 +2,23 @@ import asyncio
 from aiogram import Dispatcher
 from handlers.register_handlers import register_handlers
 from bot import bot
-from cron.price_checker import check_price_drops
+from cron.rollup import price_history_rollup
+from notifier import alert_outbox_relay
 from utils.logger import get_logger
-from config import Config
+from utils.startup import log_startup_report
 
 logger = get_logger(__name__)
 
 dp = Dispatcher()
 
-async def periodic_price_check():
-    while True:
-        try:
-            logger.info("Price check sleeping..")
-            await asyncio.sleep(Config.CRON_INTERVAL)
-            logger.info("Running price check...")
-            await check_price_drops()
-        except Exception as e:
-            logger.error(f"Error in periodic price check: {e}")
-            # Sleep a bit before retrying after error
-            await asyncio.sleep(60)
-
 async def main() -> None:
     try:
         register_handlers(dp)
-        # Start the periodic price check task
-        asyncio.create_task(periodic_price_check())
+        # Deliver alerts written by the price check workers (worker.py)
+        asyncio.create_task(alert_outbox_relay.run())
+        # Start the price history rollup job
+        asyncio.create_task(price_history_rollup.run())
+        log_startup_report("Bot")
         await dp.start_polling(bot)
     except Exception as e:
         logger.error(f"Error in main: {e}")
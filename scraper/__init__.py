@@ -1 +1,6 @@
-from .scraper import SmartScraper
+def __getattr__(name):
+    # Loaded on first use, so importing e.g. scraper.canonical stays cheap
+    if name == "SmartScraper":
+        from .scraper import SmartScraper
+        return SmartScraper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
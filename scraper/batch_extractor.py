@@ -0,0 +1,152 @@
+import asyncio
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+from config import Config
+from utils.logger import get_logger
+from .minimizer import estimate_tokens
+from .prompt import BATCH_SCRAPE_PROMPT
+from .stats import scraper_stats
+from .structured import normalize_currency, parse_price
+
+logger = get_logger(__name__)
+
+def supports_batching(model: Optional[str]) -> bool:
+    """Whether batched extraction can serve a model; it talks to Groq directly."""
+    return bool(model) and model.startswith("groq/")
+
+@dataclass
+class _PendingPage:
+    url: str
+    excerpt: str
+    future: asyncio.Future
+
+class BatchExtractor:
+    """
+    Collects page excerpts for a short window and extracts all of them with
+    a single LLM request, so per-request overhead and rate-limit slots are
+    shared across pages. Each caller gets back only its own page's result.
+
+    Requests go straight to Groq, so this is only used for "groq/" models;
+    other providers keep going through the ScrapeGraphAI graph.
+    """
+
+    def __init__(self, batch_size: int = Config.LLM_BATCH_SIZE,
+                 token_budget: int = Config.LLM_BATCH_TOKEN_BUDGET,
+                 window: float = Config.LLM_BATCH_WINDOW):
+        self.batch_size = batch_size
+        self.token_budget = token_budget
+        self.window = window
+        # Groq model names come without the "groq/" provider prefix
+        self.model = Config.LLM_MODEL.split("/", 1)[-1]
+        self._client = None
+        self._pending: List[_PendingPage] = []
+        self._pending_tokens = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Batches being sent to the LLM, kept so they are not garbage collected
+        self._dispatching: Set[asyncio.Task] = set()
+
+    @property
+    def client(self):
+        """The Groq client, created (and the SDK imported) on first use."""
+        if self._client is None:
+            from groq import AsyncGroq
+            self._client = AsyncGroq(api_key=Config.LLM_TOKEN)
+        return self._client
+
+    async def extract(self, url: str, excerpt: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract product information from one page excerpt as part of a batch.
+
+        Returns:
+            Dictionary containing product information, or None if the LLM
+            gave no usable answer for this page
+        """
+        tokens = estimate_tokens(excerpt)
+        if self._pending and self._pending_tokens + tokens > self.token_budget:
+            self._flush()
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingPage(url, excerpt, future))
+        self._pending_tokens += tokens
+
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_tokens = self._pending, [], 0
+        task = asyncio.create_task(self._dispatch(batch))
+        self._dispatching.add(task)
+        task.add_done_callback(self._dispatching.discard)
+
+    async def close(self) -> None:
+        """Send any batch still collecting and wait for all batches in flight."""
+        self._flush()
+        if self._dispatching:
+            await asyncio.gather(*self._dispatching, return_exceptions=True)
+
+    async def _dispatch(self, batch: List[_PendingPage]) -> None:
+        try:
+            results = await self._complete(batch)
+        except Exception as e:
+            logger.error(f"Batched LLM extraction of {len(batch)} pages failed: {e}")
+            results = {}
+
+        scraper_stats.incr("llm_batches")
+        scraper_stats.incr("llm_batched_pages", len(batch))
+        for index, page in enumerate(batch, 1):
+            if not page.future.done():
+                page.future.set_result(results.get(index))
+
+    async def _complete(self, batch: List[_PendingPage]) -> Dict[int, Dict[str, Any]]:
+        pages = "\n\n".join(
+            f"=== PAGE {index} ===\nURL: {page.url}\n{page.excerpt}"
+            for index, page in enumerate(batch, 1)
+        )
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            temperature=Config.LLM_TEMPERATURE,
+            messages=[
+                {"role": "system", "content": BATCH_SCRAPE_PROMPT},
+                {"role": "user", "content": pages},
+            ],
+        )
+        logger.info(f"Extracted {len(batch)} pages in one LLM request")
+        return self._parse(response.choices[0].message.content or "", len(batch))
+
+    @staticmethod
+    def _parse(content: str, size: int) -> Dict[int, Dict[str, Any]]:
+        """Split the LLM's JSON array back into per-page results keyed by page number."""
+        match = re.search(r"\[.*\]", content, re.DOTALL)
+        if not match:
+            logger.warning("Batched LLM response contained no JSON array")
+            return {}
+        items = json.loads(match.group(0))
+
+        results = {}
+        for position, item in enumerate(items, 1):
+            if not isinstance(item, dict):
+                continue
+            index = item.get("page", position)
+            if not isinstance(index, int) or not 1 <= index <= size:
+                continue
+            name = item.get("product_name")
+            price = parse_price(item.get("price"))
+            currency = normalize_currency(item.get("currency"))
+            trackable = bool(item.get("is_trackable") and name and price and currency)
+            results[index] = {
+                "is_trackable": trackable,
+                "product_name": name if trackable else None,
+                "price": price if trackable else None,
+                "currency": currency if trackable else None,
+            }
+        return results
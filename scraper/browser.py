@@ -0,0 +1,250 @@
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from config import Config
+from utils.logger import get_logger
+from utils.url import get_domain
+from .fetcher import FetchResponse
+from .politeness import domain_scheduler
+
+logger = get_logger(__name__)
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def needs_rendering(url: str) -> bool:
+    """Whether a link belongs to a shop that only renders prices with JavaScript."""
+    domain = get_domain(url)
+    return any(domain == d or domain.endswith(f".{d}") for d in Config.RENDER_DOMAINS)
+
+def _process_tree() -> Dict[int, int]:
+    """Map every visible pid to its parent pid."""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces, so split after it
+                fields = f.read().rsplit(")", 1)[1].split()
+            parents[int(entry)] = int(fields[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return parents
+
+def _find_process(marker: str) -> Optional[int]:
+    """Return the pid whose command line contains `marker`, if any."""
+    needle = marker.encode()
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/cmdline", "rb") as f:
+                if needle in f.read():
+                    return int(entry)
+        except OSError:
+            continue
+    return None
+
+def _tree_rss_mb(root: int) -> float:
+    """Resident memory of a process and everything started under it."""
+    parents = _process_tree()
+    members, frontier = {root}, {root}
+    while frontier:
+        frontier = {pid for pid, ppid in parents.items() if ppid in frontier} - members
+        members |= frontier
+
+    rss_pages = 0
+    for pid in members:
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                rss_pages += int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return rss_pages * PAGE_SIZE / (1024 * 1024)
+
+def _instance_rss_mb(instance: "BrowserInstance") -> Optional[float]:
+    """
+    Memory of one browser: its Chromium main process, found by the marker
+    switch it was launched with, plus its renderer and helper processes.
+    """
+    if instance.pid is None:
+        instance.pid = _find_process(instance.marker)
+    if instance.pid is None:
+        return None
+    return _tree_rss_mb(instance.pid)
+
+@dataclass
+class BrowserInstance:
+    # None until the launch finishes
+    browser: object
+    # Unused command-line switch that identifies this browser's processes
+    marker: str
+    pid: Optional[int] = None
+    pages_served: int = 0
+    active: int = 0
+    retired: bool = False
+    # Set once a launch started by _acquire has finished, either way
+    launched: Optional[asyncio.Event] = None
+
+    @property
+    def connected(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+class BrowserPool:
+    """
+    Pool of long-lived headless Chromium instances for shops that need
+    JavaScript rendering. Each render gets its own browser context, so
+    cookies and storage never leak between scrapes, while the browser
+    process itself is reused.
+
+    Instances are recycled after serving BROWSER_MAX_PAGES pages, or when
+    an instance's processes use more than BROWSER_MEMORY_LIMIT_MB, and at most
+    BROWSER_CONCURRENCY pages render at once.
+    """
+
+    def __init__(self):
+        self._playwright = None
+        self._instances: List[BrowserInstance] = []
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(Config.BROWSER_CONCURRENCY)
+
+    async def render(self, url: str) -> Optional[FetchResponse]:
+        """
+        Load a page in a browser and return the rendered HTML.
+
+        Returns:
+            The response, or None if the page could not be rendered
+        """
+        async with self._semaphore:
+            try:
+                instance = await self._acquire()
+            except Exception as e:
+                logger.error(f"Could not start browser for {url}: {str(e)}")
+                return None
+
+            context = None
+            try:
+                context = await instance.browser.new_context(user_agent=Config.SCRAPER_USER_AGENT)
+                page = await context.new_page()
+                await domain_scheduler.acquire(url)
+                started = time.monotonic()
+                response = None
+                try:
+                    response = await page.goto(
+                        url,
+                        wait_until="networkidle",
+                        timeout=Config.BROWSER_PAGE_TIMEOUT * 1000
+                    )
+                finally:
+                    domain_scheduler.record(
+                        url,
+                        response.status if response else None,
+                        time.monotonic() - started
+                    )
+                if response is None:
+                    return None
+                if not response.ok:
+                    logger.warning(f"Render of {url} returned HTTP {response.status}")
+                    return FetchResponse(status=response.status)
+                return FetchResponse(status=response.status, text=await page.content())
+            except Exception as e:
+                logger.warning(f"Render failed for {url}: {str(e)}")
+                return None
+            finally:
+                if context is not None:
+                    await context.close()
+                await self._release(instance)
+
+    async def _acquire(self) -> BrowserInstance:
+        """
+        Pick the least busy instance, launching one if the pool is not full.
+        The pool lock only guards the bookkeeping; Chromium starts outside
+        it, and renders that pick an instance still starting wait for it.
+        """
+        async with self._lock:
+            live = [i for i in self._instances if not i.retired]
+            launching = len(live) < Config.BROWSER_POOL_SIZE
+            if launching:
+                instance = BrowserInstance(
+                    browser=None,
+                    marker=f"--price-tracker-browser={uuid.uuid4().hex}",
+                    launched=asyncio.Event()
+                )
+                self._instances.append(instance)
+            else:
+                instance = min(live, key=lambda i: i.active)
+            instance.active += 1
+            instance.pages_served += 1
+
+        try:
+            if launching:
+                try:
+                    instance.browser = await self._launch(instance)
+                finally:
+                    instance.launched.set()
+            elif instance.launched is not None:
+                await instance.launched.wait()
+            if instance.browser is None:
+                raise RuntimeError("browser failed to launch")
+        except BaseException:
+            instance.active -= 1
+            instance.retired = True
+            async with self._lock:
+                if instance.active == 0 and instance in self._instances:
+                    self._instances.remove(instance)
+            raise
+        return instance
+
+    async def _launch(self, instance: BrowserInstance):
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+        logger.info("Launching headless browser")
+        browser = await self._playwright.chromium.launch(headless=True, args=[instance.marker])
+        browser.on("disconnected", lambda _: self._on_disconnected(instance))
+        return browser
+
+    def _on_disconnected(self, instance: BrowserInstance) -> None:
+        if not instance.retired:
+            logger.warning("Browser disconnected (crashed or killed), retiring it")
+            instance.retired = True
+
+    async def _release(self, instance: BrowserInstance) -> None:
+        instance.active -= 1
+        if instance.pages_served >= Config.BROWSER_MAX_PAGES:
+            instance.retired = True
+        elif not instance.connected:
+            self._on_disconnected(instance)
+        elif not instance.retired:
+            # Scanning /proc is slow, so other renders go on meanwhile
+            rss = await asyncio.to_thread(_instance_rss_mb, instance)
+            if rss is not None and rss > Config.BROWSER_MEMORY_LIMIT_MB:
+                logger.info(f"Browser using {rss:.0f} MB, recycling it")
+                instance.retired = True
+
+        async with self._lock:
+            finished = [i for i in self._instances if i.retired and i.active == 0]
+            for retired in finished:
+                self._instances.remove(retired)
+        for retired in finished:
+            await self._close(retired)
+
+    async def _close(self, instance: BrowserInstance) -> None:
+        logger.info(f"Closing browser after {instance.pages_served} pages")
+        try:
+            await instance.browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing browser: {str(e)}")
+
+    async def close(self) -> None:
+        async with self._lock:
+            for instance in self._instances:
+                if instance.browser is not None:
+                    await self._close(instance)
+            self._instances.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
@@ -0,0 +1,56 @@
+import threading
+from typing import Any, Dict, Optional
+from cachetools import TTLCache
+from config import Config
+from utils.logger import get_logger
+from .canonical import canonicalize_url
+from .stats import scraper_stats
+from .storage import SqliteStore
+
+logger = get_logger(__name__)
+
+class ExtractionCache:
+    """
+    Two-tier cache of extraction results keyed by canonical URL plus page
+    fingerprint: an in-process LRU in front of a size-bounded SQLite table,
+    both expiring entries after Config.EXTRACTION_CACHE_TTL seconds. The
+    disk tier survives restarts, so a redeploy starts warm.
+    """
+
+    def __init__(self, ttl: float = Config.EXTRACTION_CACHE_TTL,
+                 memory_size: int = Config.EXTRACTION_CACHE_MEMORY_SIZE,
+                 disk_size: int = Config.EXTRACTION_CACHE_DISK_SIZE):
+        self._memory: TTLCache = TTLCache(maxsize=memory_size, ttl=ttl)
+        self._lock = threading.Lock()
+        self._disk = SqliteStore("extraction_cache", ttl=ttl, max_entries=disk_size)
+
+    @staticmethod
+    def key(url: str, fingerprint: str) -> str:
+        return f"{canonicalize_url(url)}#{fingerprint}"
+
+    def get(self, url: str, fingerprint: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not fingerprint:
+            return None
+
+        key = self.key(url, fingerprint)
+        with self._lock:
+            result = self._memory.get(key)
+        if result is not None:
+            scraper_stats.incr("cache_memory_hits")
+            return result
+
+        result = self._disk.get(key)
+        if result is not None:
+            scraper_stats.incr("cache_disk_hits")
+            with self._lock:
+                self._memory[key] = result
+            return result
+
+        scraper_stats.incr("cache_misses")
+        return None
+
+    def set(self, url: str, fingerprint: str, result: Dict[str, Any]) -> None:
+        key = self.key(url, fingerprint)
+        with self._lock:
+            self._memory[key] = result
+        self._disk.set(key, result)
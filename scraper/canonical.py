@@ -0,0 +1,104 @@
+import re
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import SplitResult, parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from or who the
+# visitor is, on any shop
+TRACKING_PARAMS = (
+    "utm_", "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "srsltid", "sessionid", "session_id",
+)
+
+# Amazon product pages are fully identified by their ASIN
+AMAZON_ASIN = re.compile(
+    r"/(?:dp|gp/product|gp/aw/d|exec/obidos/asin|o/asin)/([A-Z0-9]{10})(?:[/?]|$)",
+    re.I
+)
+
+# Flipkart product pages only need the product slug, item id and pid
+FLIPKART_PARAMS = ("pid",)
+
+def _host(parts: SplitResult) -> str:
+    return (parts.hostname or "").lower()
+
+def _is_shop(host: str, name: str) -> bool:
+    """Whether a host belongs to a shop on any of its country domains."""
+    labels = host.split(".")
+    return name in labels[:-1]
+
+def _amazon(parts: SplitResult) -> Optional[str]:
+    match = AMAZON_ASIN.search(parts.path)
+    if not match:
+        return None
+    # Mobile and regional subdomains serve the same catalogue as www
+    tld = _host(parts).split("amazon.", 1)[1]
+    return f"https://www.amazon.{tld}/dp/{match.group(1).upper()}"
+
+def _flipkart(parts: SplitResult) -> Optional[str]:
+    path = parts.path
+    # Share links from the app go through /dl/ on dl.flipkart.com
+    if path.startswith("/dl/"):
+        path = path[3:]
+    if "/p/" not in path:
+        return None
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query)
+        if key in FLIPKART_PARAMS
+    ]
+    return urlunsplit(("https", "www.flipkart.com", path.rstrip("/"), urlencode(query), ""))
+
+# Per-shop rules: the shop's domain label and a function returning the
+# canonical URL, or None to fall back to the generic rules
+SHOP_RULES: List[Tuple[str, Callable[[SplitResult], Optional[str]]]] = [
+    ("amazon", _amazon),
+    ("flipkart", _flipkart),
+]
+
+# Subdomains serving the mobile or AMP version of a shop's pages
+MOBILE_HOST_PREFIXES = ("m.", "mobile.", "amp.")
+
+def _route_fragment(fragment: str) -> str:
+    """
+    Keep fragments that single-page shops route on (#/product/42, #!/item),
+    since they pick the product; anything else is an in-page anchor.
+    """
+    return fragment if fragment.startswith(("/", "!")) else ""
+
+def _strip_amp(path: str) -> str:
+    """Drop AMP markers from a path, e.g. /amp/product or /product/amp."""
+    path = re.sub(r"^/amp(?=/)", "", path)
+    return re.sub(r"/amp/?$", "", path)
+
+def canonicalize_url(url: str) -> str:
+    """
+    Return a canonical form of a product URL, so the same page pasted in
+    different ways (tracking and affiliate parameters, mobile or AMP
+    hosts, session tokens) maps to one key. Fragments are dropped unless
+    they look like client-side routes.
+
+    Shops with their own rules, such as Amazon and Flipkart, are reduced
+    to the parts that identify the product. Anything else keeps its path
+    and non-tracking query parameters, sorted. The result is itself a
+    working URL.
+    """
+    parts = urlsplit(url.strip())
+    host = _host(parts)
+    for name, rule in SHOP_RULES:
+        if _is_shop(host, name):
+            canonical = rule(parts)
+            if canonical:
+                return canonical
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS) and key.lower() != "amp"
+    )
+    for prefix in MOBILE_HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    netloc = f"{host}:{parts.port}" if parts.port else host
+    path = _strip_amp(parts.path).rstrip("/") or "/"
+    return urlunsplit((
+        parts.scheme.lower(), netloc, path, urlencode(query), _route_fragment(parts.fragment)
+    ))
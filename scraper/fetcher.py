@@ -0,0 +1,92 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+import httpx
+from config import Config
+from utils.logger import get_logger
+from .politeness import domain_scheduler, parse_retry_after
+
+logger = get_logger(__name__)
+
+@dataclass
+class FetchResponse:
+    status: int
+    text: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300 and self.text is not None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+class Fetcher:
+    """
+    Async page fetcher sharing one pooled HTTP client (keep-alive, HTTP/2
+    where the server supports it) across all scrapes. Requests are paced
+    per shop by the domain scheduler.
+    """
+
+    def __init__(self):
+        self.client = httpx.AsyncClient(
+            headers={
+                "User-Agent": Config.SCRAPER_USER_AGENT,
+                "Accept-Language": "en-US,en;q=0.9",
+            },
+            http2=True,
+            follow_redirects=True,
+            timeout=Config.SCRAPER_FETCH_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=Config.SCRAPER_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.SCRAPER_MAX_CONNECTIONS,
+            ),
+        )
+
+    async def fetch(self, url: str, *, etag: Optional[str] = None,
+                    last_modified: Optional[str] = None) -> Optional[FetchResponse]:
+        """
+        GET a page, conditionally if validators from an earlier fetch are given.
+
+        Returns:
+            The response (status 304 when the page is unchanged), or None
+            if the request failed
+        """
+        headers: Dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        await domain_scheduler.acquire(url)
+        started = time.monotonic()
+        try:
+            response = await self.client.get(url, headers=headers)
+        except Exception as e:
+            logger.warning(f"Fetch failed for {url}: {str(e)}")
+            domain_scheduler.record(url, None, time.monotonic() - started)
+            return None
+        domain_scheduler.record(
+            url,
+            response.status_code,
+            time.monotonic() - started,
+            parse_retry_after(response.headers.get("Retry-After"))
+        )
+
+        if response.status_code == 304:
+            return FetchResponse(status=304, etag=etag, last_modified=last_modified)
+        if response.is_error:
+            logger.warning(f"Fetch of {url} returned HTTP {response.status_code}")
+            return FetchResponse(status=response.status_code)
+
+        return FetchResponse(
+            status=response.status_code,
+            text=response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,59 @@
+import hashlib
+import re
+from typing import Optional
+from lxml import html as lxml_html
+
+# Elements that never carry the product's name or price
+NOISE_TAGS = ("script", "style", "noscript", "iframe", "svg", "template", "link")
+
+# Ad slots and similar widgets that rotate on every load
+AD_SLOT = re.compile(r"(^|[\s_-])(ad|ads|adslot|advert\w*|adsbygoogle|sponsored|banner)([\s_-]|$)", re.I)
+
+# Clock times and ISO dates rendered into the page ("updated 10:42:07")
+TIMESTAMP = re.compile(r"\b\d{1,2}:\d{2}(:\d{2})?\b|\b\d{4}-\d{2}-\d{2}(T[\d:.+\-Z]+)?\b")
+
+# How many levels above the price element still belong to the price region
+REGION_DEPTH = 3
+
+def _price_region(tree, price_xpath: Optional[str]):
+    """Return the block around the learned price element, or the whole body."""
+    if price_xpath:
+        try:
+            matches = tree.xpath(price_xpath)
+        except Exception:
+            matches = []
+        if matches:
+            region = matches[0]
+            for _ in range(REGION_DEPTH):
+                if region.getparent() is None:
+                    break
+                region = region.getparent()
+            return region
+    body = tree.find("body")
+    return body if body is not None else tree
+
+def page_fingerprint(page_html: str, price_xpath: Optional[str] = None) -> str:
+    """
+    Hash the price-bearing part of a page, ignoring scripts, attributes
+    (nonces, tracking ids), timestamps and ad slots, so two fetches of an
+    unchanged product page hash the same.
+    """
+    tree = lxml_html.fromstring(page_html)
+    parts = []
+
+    # Structured product data and price meta tags, which extraction may use
+    for script in tree.xpath('//script[@type="application/ld+json"]'):
+        parts.append(" ".join(script.text_content().split()))
+    for meta in tree.xpath('//meta[contains(@property, "price") or @property="og:title"]'):
+        parts.append(f"{meta.get('property')}={meta.get('content')}")
+
+    for element in tree.xpath("|".join(f"//{tag}" for tag in NOISE_TAGS)):
+        element.drop_tree()
+    for element in tree.xpath("//*[@id or @class]"):
+        if AD_SLOT.search(f"{element.get('id', '')} {element.get('class', '')}"):
+            element.drop_tree()
+
+    region = _price_region(tree, price_xpath)
+    parts.append(TIMESTAMP.sub("", " ".join(region.text_content().split())))
+
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
@@ -0,0 +1,186 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional
+from config import Config
+from utils.logger import get_logger
+from utils.url import get_domain
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Statuses that mean the shop itself is failing or blocking us, rather than
+# that one product page is gone
+FAILURE_STATUSES = (403, 429)
+
+@dataclass
+class DomainCircuit:
+    domain: str
+    state: str = CLOSED
+    outcomes: Deque[bool] = field(default_factory=lambda: deque(maxlen=Config.CIRCUIT_WINDOW))
+    # Whether each successfully fetched page yielded a product
+    extractions: Deque[bool] = field(default_factory=lambda: deque(maxlen=Config.CIRCUIT_WINDOW))
+    opened_at: float = 0.0
+    trial_in_flight: bool = False
+    total_failures: int = 0
+    total_successes: int = 0
+    timeouts: int = 0
+    not_trackable: int = 0
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def extraction_error_rate(self) -> float:
+        if not self.extractions:
+            return 0.0
+        return self.extractions.count(False) / len(self.extractions)
+
+class DomainHealth:
+    """
+    Per-shop circuit breaker over fetch outcomes.
+
+    A domain's circuit opens once at least CIRCUIT_MIN_SAMPLES of its last
+    CIRCUIT_WINDOW fetches were made and CIRCUIT_ERROR_RATE of them failed.
+    Only fetch errors, timeouts, 403, 429 and 5xx responses count as fetch
+    failures.
+
+    Pages that fetched fine but yielded no product are tracked separately,
+    since one delisted product says nothing about the shop. When
+    CIRCUIT_EXTRACTION_ERROR_RATE of them fail, the shop has most likely
+    changed its layout or is serving a bot wall, and the circuit opens too.
+    While open, its links are not scraped at all. After CIRCUIT_COOLDOWN
+    seconds the circuit goes half-open and lets one trial scrape through:
+    success closes it, failure opens it for another cooldown.
+    """
+
+    def __init__(self):
+        self._circuits: Dict[str, DomainCircuit] = {}
+
+    def _circuit(self, url: str) -> DomainCircuit:
+        domain = get_domain(url)
+        if domain not in self._circuits:
+            self._circuits[domain] = DomainCircuit(domain)
+        return self._circuits[domain]
+
+    def allow(self, url: str) -> bool:
+        """Whether a link may be scraped now. Admits one trial when half-open."""
+        circuit = self._circuit(url)
+        if circuit.state == OPEN and time.monotonic() - circuit.opened_at >= Config.CIRCUIT_COOLDOWN:
+            circuit.state = HALF_OPEN
+            logger.info(f"Circuit for {circuit.domain} half-open, sending a trial request")
+        if circuit.state == CLOSED:
+            return True
+        if circuit.state == HALF_OPEN and not circuit.trial_in_flight:
+            circuit.trial_in_flight = True
+            return True
+        return False
+
+    def retry_in(self, url: str) -> float:
+        """Seconds until a link on an open circuit may be tried again."""
+        circuit = self._circuit(url)
+        if circuit.state != OPEN:
+            return 0.0
+        return max(Config.CIRCUIT_COOLDOWN - (time.monotonic() - circuit.opened_at), 0.0)
+
+    def record(self, url: str, success: bool) -> None:
+        circuit = self._circuit(url)
+        circuit.outcomes.append(success)
+        if success:
+            circuit.total_successes += 1
+        else:
+            circuit.total_failures += 1
+
+        if circuit.state == HALF_OPEN:
+            circuit.trial_in_flight = False
+            if success:
+                circuit.state = CLOSED
+                circuit.outcomes.clear()
+                circuit.extractions.clear()
+                logger.info(f"Circuit for {circuit.domain} closed after a successful trial")
+            else:
+                self._open(circuit, "a failed trial")
+        elif (
+            circuit.state == CLOSED
+            and len(circuit.outcomes) >= Config.CIRCUIT_MIN_SAMPLES
+            and circuit.error_rate >= Config.CIRCUIT_ERROR_RATE
+        ):
+            self._open(circuit, f"{circuit.error_rate:.0%} failed fetches")
+
+    def record_extraction(self, url: str, trackable: bool) -> None:
+        """Record whether a successfully fetched page yielded a product."""
+        circuit = self._circuit(url)
+        circuit.extractions.append(trackable)
+        if not trackable:
+            circuit.not_trackable += 1
+        if (
+            circuit.state == CLOSED
+            and len(circuit.extractions) >= Config.CIRCUIT_MIN_SAMPLES
+            and circuit.extraction_error_rate >= Config.CIRCUIT_EXTRACTION_ERROR_RATE
+        ):
+            self._open(circuit, f"{circuit.extraction_error_rate:.0%} of pages yielding no product")
+
+    def record_status(self, url: str, status: Optional[int]) -> None:
+        """Record a fetch by its HTTP status, None meaning it got no response."""
+        failed = status is None or status >= 500 or status in FAILURE_STATUSES
+        self.record(url, success=not failed)
+
+    def cancel_trial(self, url: str) -> None:
+        """Let another trial through when a half-open trial was abandoned unfinished."""
+        circuit = self._circuit(url)
+        if circuit.state == HALF_OPEN:
+            circuit.trial_in_flight = False
+
+    def record_timeout(self, url: str) -> None:
+        """Count a scrape or parse of a link that overran its deadline."""
+        self._circuit(url).timeouts += 1
+
+    @staticmethod
+    def _open(circuit: DomainCircuit, reason: str) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = time.monotonic()
+        logger.warning(
+            f"Circuit for {circuit.domain} opened after {reason}, "
+            f"pausing scrapes for {Config.CIRCUIT_COOLDOWN}s"
+        )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Health of every domain scraped so far."""
+        return {
+            domain: {
+                "state": circuit.state,
+                "error_rate": round(circuit.error_rate, 3),
+                "extraction_error_rate": round(circuit.extraction_error_rate, 3),
+                "samples": len(circuit.outcomes),
+                "successes": circuit.total_successes,
+                "failures": circuit.total_failures,
+                "timeouts": circuit.timeouts,
+                "not_trackable": circuit.not_trackable,
+            }
+            for domain, circuit in self._circuits.items()
+        }
+
+    def unhealthy(self) -> Dict[str, Dict[str, Any]]:
+        """Health of domains whose circuit is not closed."""
+        return {
+            domain: health
+            for domain, health in self.snapshot().items()
+            if health["state"] != CLOSED
+        }
+
+    def timeouts(self) -> Dict[str, int]:
+        """Number of timed-out scrapes per domain, for domains that had any."""
+        return {
+            domain: circuit.timeouts
+            for domain, circuit in self._circuits.items()
+            if circuit.timeouts
+        }
+
+# Create a single instance for use throughout the application
+domain_health = DomainHealth()
@@ -0,0 +1,109 @@
+import re
+from typing import List, Tuple
+from lxml import html as lxml_html
+
+# Elements that never carry the product's name or price
+BOILERPLATE_TAGS = (
+    "script", "style", "noscript", "iframe", "svg", "template", "link", "meta",
+    "nav", "footer", "aside", "button", "select", "input", "textarea",
+)
+
+# Containers whose own markup is noise but whose contents can be the product's
+# price, like the add-to-cart form on most shop pages
+UNWRAP_TAGS = ("form", "fieldset", "label")
+
+# Page sections that are long and rarely hold the product's own price
+BOILERPLATE_SECTION = re.compile(
+    r"review|comment|recommend|similar|related|carousel|breadcrumb|cookie|"
+    r"newsletter|footer|navbar|menu|sponsored|advert",
+    re.I
+)
+
+PRICE_TEXT = re.compile(r"(₹|rs\.?|inr|\$|usd|€|eur|£|gbp|¥)\s?\d[\d,]*(\.\d+)?", re.I)
+PRICE_HINT = re.compile(r"price|amount|cost", re.I)
+TITLE_HINT = re.compile(r"title|product[-_]?name", re.I)
+
+# How many levels above a price or title node count as its neighbourhood
+NEIGHBOURHOOD_DEPTH = 2
+
+# Skip neighbourhoods that grew into whole page sections
+MAX_REGION_CHARS = 2000
+
+# Rough characters-per-token ratio for the page text we send to the LLM
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def _text(element) -> str:
+    return " ".join(element.text_content().split())
+
+def _strip_boilerplate(tree) -> None:
+    for element in tree.xpath("|".join(f"//{tag}" for tag in BOILERPLATE_TAGS)):
+        element.drop_tree()
+    for element in tree.xpath("|".join(f"//{tag}" for tag in UNWRAP_TAGS)):
+        element.drop_tag()
+    for element in tree.xpath("//body//*[@id or @class]"):
+        if BOILERPLATE_SECTION.search(f"{element.get('id', '')} {element.get('class', '')}"):
+            element.drop_tree()
+
+def _anchors(tree) -> List:
+    """Return title- and price-like elements in document order."""
+    anchors = []
+    for element in tree.iter():
+        if not isinstance(element.tag, str):
+            continue
+        hints = f"{element.get('id', '')} {element.get('class', '')} {element.get('itemprop', '')}"
+        own_text = (element.text or "").strip()
+        if (
+            element.tag == "h1"
+            or TITLE_HINT.search(hints)
+            or PRICE_HINT.search(hints)
+            or PRICE_TEXT.search(own_text)
+        ):
+            anchors.append(element)
+    return anchors
+
+def _neighbourhood(element):
+    region = element
+    for _ in range(NEIGHBOURHOOD_DEPTH):
+        parent = region.getparent()
+        if parent is None or parent.tag in ("body", "html") or len(_text(parent)) > MAX_REGION_CHARS:
+            break
+        region = parent
+    return region
+
+def minimize_page(page_html: str, max_tokens: int) -> Tuple[str, int, int]:
+    """
+    Reduce a page to the text the LLM needs to find the product: the page
+    title plus the neighbourhood of title- and price-like nodes, with
+    navigation, scripts, reviews and other boilerplate removed, capped to
+    roughly `max_tokens` tokens.
+
+    Runs in a worker process, so it only takes and returns plain values.
+
+    Returns:
+        The excerpt, the estimated tokens of the raw page and of the excerpt
+    """
+    raw_tokens = estimate_tokens(page_html)
+    tree = lxml_html.fromstring(page_html)
+    title = " ".join((tree.findtext(".//title") or "").split())
+    _strip_boilerplate(tree)
+
+    regions: List = []
+    for anchor in _anchors(tree):
+        region = _neighbourhood(anchor)
+        # Skip regions already covered by one we kept
+        if any(region is kept or kept in region.iterancestors() for kept in regions):
+            continue
+        regions = [kept for kept in regions if region not in kept.iterancestors()]
+        regions.append(region)
+
+    parts = [f"Title: {title}"] if title else []
+    parts.extend(text for text in (_text(region) for region in regions) if text)
+    if len(parts) <= 1:
+        body = tree.find("body")
+        parts.append(_text(body if body is not None else tree))
+
+    excerpt = "\n".join(parts)[:max_tokens * CHARS_PER_TOKEN]
+    return excerpt, raw_tokens, estimate_tokens(excerpt)
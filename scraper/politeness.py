@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import Dict, Optional
+from config import Config
+from utils.logger import get_logger
+from utils.rate_limit import TokenBucket
+from utils.url import get_domain
+
+logger = get_logger(__name__)
+
+# Responses that mean the shop wants us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds; HTTP dates are ignored."""
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
+
+class DomainLimiter:
+    """
+    Request pacing for one shop: a token bucket whose rate adapts AIMD-style
+    (additive increase while the shop responds quickly, multiplicative
+    decrease on throttling or slow responses) plus a minimum gap between
+    consecutive requests.
+    """
+
+    def __init__(self, domain: str):
+        self.domain = domain
+        self.bucket = TokenBucket(Config.SCRAPER_DOMAIN_RATE, capacity=Config.SCRAPER_DOMAIN_BURST)
+        self._last_request = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    async def acquire(self) -> None:
+        await self.bucket.acquire()
+        async with self._lock:
+            wait = self._last_request + Config.SCRAPER_DOMAIN_MIN_SPACING - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_request = time.monotonic()
+
+    def record(self, status: Optional[int], elapsed: float,
+               retry_after: Optional[float] = None) -> None:
+        """Adapt the rate to how the shop answered the last request."""
+        if status in THROTTLE_STATUSES or elapsed > Config.SCRAPER_SLOW_RESPONSE:
+            self.bucket.rate = max(
+                self.rate * Config.SCRAPER_RATE_DECREASE,
+                Config.SCRAPER_DOMAIN_MIN_RATE
+            )
+            if status in THROTTLE_STATUSES:
+                self.bucket.pause(retry_after if retry_after is not None else 1 / self.rate)
+            logger.warning(
+                f"Slowing down {self.domain} to {self.rate:.2f} req/s "
+                f"(status {status}, {elapsed:.1f}s)"
+            )
+        elif status is not None and status < 400:
+            self.bucket.rate = min(
+                self.rate + Config.SCRAPER_RATE_INCREASE,
+                Config.SCRAPER_DOMAIN_MAX_RATE
+            )
+
+class DomainScheduler:
+    """
+    Keeps a DomainLimiter per shop so a burst of checks against one host is
+    spread out while requests to other hosts go ahead unimpeded.
+    """
+
+    def __init__(self):
+        self._limiters: Dict[str, DomainLimiter] = {}
+
+    def limiter(self, url: str) -> DomainLimiter:
+        domain = get_domain(url)
+        if domain not in self._limiters:
+            self._limiters[domain] = DomainLimiter(domain)
+        return self._limiters[domain]
+
+    async def acquire(self, url: str) -> None:
+        """Wait until the link's shop may be sent another request."""
+        await self.limiter(url).acquire()
+
+    def record(self, url: str, status: Optional[int], elapsed: float,
+               retry_after: Optional[float] = None) -> None:
+        self.limiter(url).record(status, elapsed, retry_after)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Current request rate per domain."""
+        return {domain: round(limiter.rate, 3) for domain, limiter in self._limiters.items()}
+
+# Shared by the HTTP fetcher and the browser pool
+domain_scheduler = DomainScheduler()
@@ -23,3 +23,12 @@ Rules:
 
 Only respond with the JSON, no other text.
 """
+
+BATCH_SCRAPE_PROMPT = SCRAPE_PROMPT.replace(
+    "Only respond with the JSON, no other text.",
+    """You will be given several webpages at once. Each one starts with a line "=== PAGE <n> ===".
+Apply the instructions above to every page independently and respond with a JSON array holding
+one object per page, in page order. Add a "page" field with <n> to each object.
+
+Only respond with the JSON array, no other text."""
+)
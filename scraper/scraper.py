@@ -1,13 +1,38 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from config import Config
 from utils.logger import get_logger
+from .batch_extractor import BatchExtractor, supports_batching
+from .browser import BrowserPool, needs_rendering
+from .cache import ExtractionCache
+from .canonical import canonicalize_url
+from .fetcher import Fetcher, FetchResponse
+from .fingerprint import page_fingerprint
+from .health import domain_health
+from .minimizer import minimize_page
 from .prompt import SCRAPE_PROMPT
-from scrapegraphai.graphs import SmartScraperGraph
+from .selector_cache import SelectorCache, apply_selectors, derive_selectors
+from .stats import scraper_stats
+from .storage import SqliteStore
+from .structured import extract_structured
+from .workers import SupervisedPool
 
 logger = get_logger(__name__)
 
+def run_graph(source: str, graph_config: dict) -> Dict[str, Optional[str]]:
+    """Run the single-page LLM graph. Executed in an LLM worker process."""
+    # scrapegraphai pulls in langchain and friends, which take seconds and
+    # hundreds of MB to import, so only worker processes ever load it
+    from scrapegraphai.graphs import SmartScraperGraph
+
+    smart_scraper_graph = SmartScraperGraph(
+        prompt=SCRAPE_PROMPT,
+        source=source,
+        config=graph_config,
+    )
+    return smart_scraper_graph.run()
+
 class SmartScraper:
     """
     Scraper class that uses AI to extract product information from web pages.
@@ -21,50 +46,276 @@ class SmartScraper:
                 "temperature": Config.LLM_TEMPERATURE,
             }
         }
-        self.executor = ThreadPoolExecutor()
+        self.executor = ThreadPoolExecutor(max_workers=Config.SCRAPER_MAX_WORKERS)
+        # HTML parsing is CPU-bound and LLM graph runs can hang, so both run
+        # in worker processes that are killed when they overrun
+        self.parse_workers = SupervisedPool(Config.SCRAPER_PARSE_PROCESSES, "parse")
+        self.llm_workers = SupervisedPool(Config.SCRAPER_LLM_PROCESSES, "llm")
+        self.fetcher = Fetcher()
+        self.browser_pool = BrowserPool()
+        self.selector_cache = SelectorCache()
+        self.cache = ExtractionCache()
+        self.batch_extractor = (
+            BatchExtractor()
+            if Config.LLM_BATCH_SIZE > 1 and supports_batching(Config.LLM_MODEL)
+            else None
+        )
+        # Per-link HTTP validators and fingerprint of the last fetched
+        # version, only useful while the matching cached result is
+        self.page_state = SqliteStore(
+            "page_state",
+            ttl=Config.EXTRACTION_CACHE_TTL,
+            max_entries=Config.EXTRACTION_CACHE_DISK_SIZE
+        )
+        self.stats = scraper_stats
+        # Scrapes currently running, by canonical URL
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def close(self) -> None:
+        """Finish outstanding LLM batches and shut down the browsers."""
+        if self.batch_extractor:
+            await self.batch_extractor.close()
+        await self.browser_pool.close()
 
-    async def scrape(self, *, url: str) -> Dict[str, Optional[str]]:
+    async def scrape(self, *, url: str, last_price: Optional[float] = None) -> Dict[str, Optional[str]]:
         """
         Asynchronously scrape product information from a URL.
+
+        Concurrent scrapes of the same page (by canonical URL), e.g. a user
+        tracking a link while the checker is scraping it, share a single
+        in-flight scrape and all get its result.
         
         Args:
             url: The URL to scrape
+            last_price: The price last recorded for this product, if known,
+                used to sanity-check prices read with learned selectors
             
         Returns:
             Dictionary containing product information
         """
+        key = canonicalize_url(url)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._scrape_with_deadline(url, last_price))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            logger.info(f"Joining in-flight scrape for URL: {url}")
+            self.stats.incr("coalesced_scrapes")
+        # Shielded so one caller giving up does not cancel the scrape for the rest
+        result = await asyncio.shield(task)
+        return dict(result)
+
+    async def _scrape_with_deadline(self, url: str,
+                                    last_price: Optional[float]) -> Dict[str, Optional[str]]:
+        """
+        Scrape a URL within SCRAPE_TIMEOUT seconds. On timeout the scrape is
+        cancelled, which kills any worker process still running for it.
+        """
+        try:
+            return await asyncio.wait_for(self._scrape_url(url, last_price), Config.SCRAPE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error(f"Scrape of URL {url} timed out after {Config.SCRAPE_TIMEOUT}s")
+            self.stats.incr("scrape_timeouts")
+            domain_health.record_timeout(url)
+            domain_health.record(url, success=False)
+            return self._not_trackable()
+
+    async def _scrape_url(self, url: str, last_price: Optional[float]) -> Dict[str, Optional[str]]:
+        """Fetch a page and extract product information from it."""
         try:
             logger.info(f"Starting scrape for URL: {url}")
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(self.executor, self._scrape, url)
+            state = await self._run(self.page_state.get, canonicalize_url(url)) or {}
+            if needs_rendering(url):
+                response = await self.browser_pool.render(url)
+            else:
+                response = await self.fetcher.fetch(
+                    url,
+                    etag=state.get("etag"),
+                    last_modified=state.get("last_modified")
+                )
+            domain_health.record_status(url, response.status if response else None)
+            if response and response.not_modified:
+                result = await self._run(self.cache.get, url, state.get("fingerprint"))
+                if result:
+                    logger.info(f"Page not modified, reusing cached result for URL: {url}")
+                    self.stats.incr("not_modified_hits")
+                    self.stats.incr("bytes_saved", state.get("size", 0))
+                    return result
+                # The cached result expired, so the page itself is needed again
+                response = await self.fetcher.fetch(url)
+
+            if response is None:
+                # No response at all (network error, failed render): let the
+                # graph try fetching the page itself
+                result = await self._scrape_llm(url)
+            elif not response.ok:
+                # Throttled, blocked or missing pages are not worth a second
+                # request or an LLM call
+                logger.warning(f"Not extracting from URL {url}: HTTP {response.status}")
+                result = self._not_trackable()
+            else:
+                result = await self._scrape(url, response.text, response, last_price)
+                domain_health.record_extraction(url, bool(result and result.get("is_trackable")))
             logger.info(f"Scrape completed for URL: {url}")
             return result
         except Exception as e:
             logger.error(f"Error scraping URL {url}: {str(e)}")
-            return {
-                "is_trackable": False,
-                "product_name": None,
-                "price": None,
-                "currency": None
-            }
+            return self._not_trackable()
 
-    def _scrape(self, url: str) -> Dict[str, Optional[str]]:
+    @staticmethod
+    def _not_trackable() -> Dict[str, Optional[str]]:
+        return {
+            "is_trackable": False,
+            "product_name": None,
+            "price": None,
+            "currency": None
+        }
+
+    async def _run(self, func, *args):
+        """Run blocking scraper work on the executor."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def _scrape(self, url: str, page_html: str, response: FetchResponse,
+                      last_price: Optional[float] = None) -> Dict[str, Optional[str]]:
         """
-        Perform the actual scraping operation.
+        Perform the actual scraping operation on a fetched page.
+
+        If a result for this URL and price-region fingerprint is cached,
+        it is reused. Otherwise structured product data
+        (JSON-LD, microdata, OpenGraph) is tried first, then selectors
+        learned from earlier LLM runs on the same page layout. The LLM only
+        runs when both fail, and what it finds is used to learn selectors
+        for next time.
         
         Args:
             url: The URL to scrape
+            page_html: The fetched page
+            response: The fetch response the page came from
+            last_price: The product's last known price, if any
             
         Returns:
             Dictionary containing product information
         """
+        fingerprint, result = await self._extract_local(url, page_html, last_price)
+        if not result:
+            result = await self._extract_llm(url, page_html)
+            if result and result.get("is_trackable"):
+                await self._remember(url, page_html, fingerprint, result)
+
+        # Validators are only worth sending while a result for this version
+        # of the page is cached; otherwise a 304 would need a second fetch
+        key = canonicalize_url(url)
+        if result and result.get("is_trackable"):
+            await self._run(self.page_state.set, key, {
+                "etag": response.etag,
+                "last_modified": response.last_modified,
+                "fingerprint": fingerprint,
+                "size": len(page_html),
+            })
+        else:
+            await self._run(self.page_state.delete, key)
+        return result
+
+    async def _extract_local(self, url: str, page_html: str,
+                             last_price: Optional[float]) -> Tuple[str, Optional[Dict[str, Optional[str]]]]:
+        """
+        Fingerprint the page and try every extraction that needs no LLM.
+
+        Returns:
+            The page fingerprint and the result, or None if the LLM is needed
+        """
+        selectors = await self._run(self.selector_cache.get, url)
+        price_xpath = selectors["price_xpath"] if selectors else None
+        fingerprint = await self._parse(url, page_fingerprint, page_html, price_xpath)
+
+        result = await self._run(self.cache.get, url, fingerprint)
+        if result:
+            logger.info(f"Price region unchanged, reusing cached result for URL: {url}")
+            self.stats.incr("fingerprint_hits")
+            self.stats.incr("bytes_saved", len(page_html))
+            return fingerprint, result
+        self.stats.incr("fingerprint_misses")
+
+        result = await self._parse(url, extract_structured, page_html)
+        if not result and selectors:
+            name, prices = await self._parse(url, apply_selectors, page_html, selectors)
+            result = await self._run(
+                self.selector_cache.result, url, selectors, name, prices, last_price
+            )
+        if result:
+            await self._run(self.cache.set, url, fingerprint, result)
+        return fingerprint, result
+
+    async def _parse(self, url: str, func, *args):
+        """
+        Run a parsing function in a parse worker process, killing it if it
+        takes longer than PARSE_TIMEOUT seconds.
+        """
+        try:
+            return await self.parse_workers.run(func, *args, timeout=Config.PARSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error(f"{func.__name__} timed out for URL {url} after {Config.PARSE_TIMEOUT}s")
+            self.stats.incr("parse_timeouts")
+            domain_health.record_timeout(url)
+            raise
+
+    async def _remember(self, url: str, page_html: str, fingerprint: str,
+                        result: Dict[str, Optional[str]]) -> None:
+        """Cache an LLM result and learn selectors from it for next time."""
         try:
-            smart_scraper_graph = SmartScraperGraph(
-                prompt=SCRAPE_PROMPT,
-                source=url,
-                config=self.graph_config,
+            selectors = await self._parse(url, derive_selectors, page_html, result)
+        except Exception as e:
+            logger.warning(f"Could not learn selectors for {url}: {e}")
+            selectors = None
+        if selectors:
+            await self._run(self.selector_cache.save, url, result, *selectors)
+        await self._run(self.cache.set, url, fingerprint, result)
+
+    async def _extract_llm(self, url: str, page_html: str) -> Dict[str, Optional[str]]:
+        """
+        Extract product information with the LLM from a minimized excerpt of
+        the page, batched with other pages when batching is enabled, falling
+        back to a single-page graph run.
+        """
+        excerpt = await self._minimize(url, page_html)
+        if self.batch_extractor and excerpt:
+            result = await self.batch_extractor.extract(url, excerpt)
+            if result is not None:
+                return result
+            logger.warning(f"No batched LLM result for {url}, falling back to a single request")
+        return await self._scrape_llm(url, excerpt)
+
+    async def _minimize(self, url: str, page_html: str) -> Optional[str]:
+        """
+        Reduce a page to the price-relevant excerpt sent to the LLM.
+
+        Returns:
+            The excerpt, or None if the page could not be minimized
+        """
+        try:
+            excerpt, raw_tokens, excerpt_tokens = await self._parse(
+                url, minimize_page, page_html, Config.LLM_EXCERPT_TOKENS
             )
-            return smart_scraper_graph.run()
+        except Exception as e:
+            logger.warning(f"Could not minimize page for URL {url}: {e}")
+            return None
+        saved = max(raw_tokens - excerpt_tokens, 0)
+        logger.info(f"Minimized page for URL {url}: {raw_tokens} -> {excerpt_tokens} tokens ({saved} saved)")
+        self.stats.incr("llm_tokens_saved", saved)
+        return excerpt
+
+    async def _scrape_llm(self, url: str, excerpt: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """
+        Extract product information with the LLM, from the page excerpt when
+        there is one, otherwise letting the graph fetch the URL itself.
+
+        The graph runs in an LLM worker process, so when the scrape's
+        deadline cancels it, the process is killed rather than left hanging.
+        """
+        try:
+            return await self.llm_workers.run(run_graph, excerpt or url, self.graph_config)
         except Exception as e:
             logger.error(f"Error in _scrape: {str(e)}")
             raise
@@ -0,0 +1,197 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from lxml import html as lxml_html
+from utils.logger import get_logger
+from utils.url import get_domain
+from .storage import SqliteStore
+from .structured import parse_price
+
+logger = get_logger(__name__)
+
+# Elements with longer text than this are containers, not price/name labels
+MAX_LABEL_LENGTH = 200
+
+# Product-specific path segments (ids, slugs) vary between pages that share
+# a template; fixed ones like "dp" or "p" are short words
+VARIABLE_SEGMENT = re.compile(r"[\d\-_.=]|^\w{25,}$")
+
+# A price read with learned selectors that moved by more than this factor
+# since the last check is confirmed with the LLM rather than trusted
+MAX_PRICE_CHANGE = 3
+
+# Ids/classes with digits in them are usually generated per render
+UNSTABLE_TOKEN = re.compile(r"\d{3,}|[a-f0-9]{8,}")
+
+def template_key(url: str) -> str:
+    """Return a key shared by all pages of one domain that use the same layout."""
+    segments = [
+        "*" if VARIABLE_SEGMENT.search(segment) else segment
+        for segment in urlparse(url).path.split("/") if segment
+    ]
+    return f"{get_domain(url)}/{'/'.join(segments)}"
+
+def _text(element) -> str:
+    return " ".join(element.text_content().split())
+
+def _find_label(tree, matches) -> Optional[Any]:
+    """Return the innermost element whose own text satisfies `matches`."""
+    found = None
+    for element in tree.iter():
+        if not isinstance(element.tag, str) or element.tag in ("script", "style", "title"):
+            continue
+        text = _text(element)
+        if len(text) <= MAX_LABEL_LENGTH and matches(text):
+            # Document order visits ancestors first, so keep descending
+            if found is None or found in element.iterancestors():
+                found = element
+    return found
+
+def _candidate_xpaths(element) -> List[str]:
+    tag = element.tag
+    candidates = []
+    element_id = element.get("id")
+    if element_id and not UNSTABLE_TOKEN.search(element_id):
+        candidates.append(f'//{tag}[@id="{element_id}"]')
+    for attribute in ("itemprop", "data-testid"):
+        value = element.get(attribute)
+        if value:
+            candidates.append(f'//{tag}[@{attribute}="{value}"]')
+    for cls in (element.get("class") or "").split():
+        if not UNSTABLE_TOKEN.search(cls):
+            candidates.append(
+                f'//{tag}[contains(concat(" ", normalize-space(@class), " "), " {cls} ")]'
+            )
+    candidates.append(element.getroottree().getpath(element))
+    return candidates
+
+def derive_xpath(tree, element) -> Optional[str]:
+    """
+    Return the most robust XPath that matches `element`, preferring ones
+    that match nothing else so accessory or "similar items" prices on the
+    same page cannot be picked up instead.
+    """
+    first_match = None
+    for xpath in _candidate_xpaths(element):
+        try:
+            matches = tree.xpath(xpath)
+        except Exception:
+            continue
+        if matches == [element]:
+            return xpath
+        if first_match is None and matches and matches[0] is element:
+            first_match = xpath
+    return first_match
+
+def apply_selectors(page_html: str, entry: Dict[str, Any]) -> Tuple[Optional[str], List[float]]:
+    """
+    Read the product name and price from a page with learned selectors.
+    Runs in a parse worker process.
+
+    Returns:
+        The name found, None if its selector matched nothing, and the
+        distinct prices of every element the price selector matched
+    """
+    try:
+        tree = lxml_html.fromstring(page_html)
+        names = tree.xpath(entry["name_xpath"])
+        prices = tree.xpath(entry["price_xpath"])
+    except Exception as e:
+        logger.warning(f"Learned selectors failed: {e}")
+        return None, []
+    name = _text(names[0]) if names else None
+    parsed = [parse_price(_text(element)) for element in prices]
+    return name, sorted({price for price in parsed if price})
+
+def derive_selectors(page_html: str, result: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """
+    Find where the LLM's name and price sit on a page and derive XPaths for
+    them. Runs in a parse worker process.
+
+    Returns:
+        The price and name XPaths, or None if either could not be derived
+    """
+    price = parse_price(result.get("price"))
+    name = " ".join(str(result.get("product_name") or "").split())
+    if not price or not name or not result.get("currency"):
+        return None
+
+    try:
+        tree = lxml_html.fromstring(page_html)
+        price_element = _find_label(tree, lambda text: parse_price(text) == price)
+        name_element = _find_label(tree, lambda text: text == name)
+        if price_element is None or name_element is None:
+            return None
+        price_xpath = derive_xpath(tree, price_element)
+        name_xpath = derive_xpath(tree, name_element)
+    except Exception as e:
+        logger.warning(f"Could not derive selectors: {e}")
+        return None
+    if not price_xpath or not name_xpath:
+        return None
+    return price_xpath, name_xpath
+
+class SelectorCache:
+    """
+    Remembers where the LLM found the name and price on a page layout, so
+    later checks of any page with that layout need only an XPath lookup.
+
+    Only the store lives here; parsing pages with the selectors is done by
+    apply_selectors and derive_selectors in parse worker processes.
+    """
+
+    def __init__(self):
+        self.store = SqliteStore("selectors")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the learned selectors for this URL's layout, if any."""
+        return self.store.get(template_key(url))
+
+    def result(self, url: str, entry: Dict[str, Any], name: Optional[str], prices: List[float],
+               last_price: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Turn what the learned selectors found into a scrape result.
+
+        Selectors that match nothing, or match several different prices,
+        are forgotten. A price far from the product's last known price is
+        not trusted this time, so the LLM checks the page instead.
+        """
+        key = template_key(url)
+        if not name or len(prices) != 1 or not self._is_plausible(prices[0], entry):
+            logger.info(f"Learned selectors for {key} stopped matching, relearning")
+            self.store.delete(key)
+            return None
+
+        price = prices[0]
+        if last_price and not last_price / MAX_PRICE_CHANGE <= price <= last_price * MAX_PRICE_CHANGE:
+            logger.warning(
+                f"Learned selectors for {key} read {price} for {url}, "
+                f"last known price {last_price}; checking with the LLM"
+            )
+            return None
+
+        logger.info(f"Extracted product via learned selectors for {key}")
+        return {
+            "is_trackable": True,
+            "product_name": name,
+            "price": price,
+            "currency": entry["currency"],
+        }
+
+    @staticmethod
+    def _is_plausible(price: float, entry: Dict[str, Any]) -> bool:
+        # Pages of one template can hold very different products, so only
+        # reject values that are orders of magnitude away from the sample;
+        # the product's own last price is the tighter check
+        return entry["sample_price"] / 1000 <= price <= entry["sample_price"] * 1000
+
+    def save(self, url: str, result: Dict[str, Any], price_xpath: str, name_xpath: str) -> None:
+        """Store selectors derived from an LLM result for this URL's layout."""
+        key = template_key(url)
+        self.store.set(key, {
+            "price_xpath": price_xpath,
+            "name_xpath": name_xpath,
+            "currency": result["currency"],
+            "sample_price": parse_price(result.get("price")),
+        })
+        logger.info(f"Learned selectors for {key}: price={price_xpath} name={name_xpath}")
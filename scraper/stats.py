@@ -0,0 +1,25 @@
+import threading
+from collections import Counter
+from typing import Dict
+
+class ScraperStats:
+    """Thread-safe counters describing how much work the scraper avoided or did."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Counter = Counter()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def hit_rate(self, hits: str, misses: str) -> float:
+        with self._lock:
+            total = self._counters[hits] + self._counters[misses]
+            return self._counters[hits] / total if total else 0.0
+
+scraper_stats = ScraperStats()
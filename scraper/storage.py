@@ -0,0 +1,75 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+from config import Config
+
+class SqliteStore:
+    """
+    JSON key-value table in a local SQLite file. Scraper state that should
+    survive restarts but doesn't belong in the main database lives here.
+    Safe to share between executor threads.
+
+    With `ttl`, entries older than that many seconds read as missing. With
+    `max_entries`, the oldest-written entries are evicted beyond that size.
+    """
+
+    # Check the size bound once per this many writes
+    EVICT_EVERY = 100
+
+    def __init__(self, table: str, path: str = Config.SCRAPER_DB_PATH,
+                 ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, updated_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl is not None and row[1] < time.time() - self.ttl:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                row = None
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, updated_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop expired entries and the oldest ones beyond `max_entries`."""
+        if self.ttl is not None:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE updated_at < ?", (time.time() - self.ttl,)
+            )
+        if self.max_entries is not None:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
@@ -0,0 +1,181 @@
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional
+from lxml import html as lxml_html
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Structured data carries ISO codes; the LLM path returns symbols, so map
+# the common ones to keep stored currencies consistent
+CURRENCY_SYMBOLS = {
+    "INR": "₹",
+    "USD": "$",
+    "EUR": "€",
+    "GBP": "£",
+    "JPY": "¥",
+}
+
+# A number with "." or "," separators, or spaces between digit groups
+PRICE_NUMBER = re.compile(r"\d(?:[\d.,]|[ \u00a0\u202f](?=\d{3}(?!\d)))*")
+
+def _parse_number(text: str) -> Optional[float]:
+    """
+    Read a number written with either separator convention: "1,299.00",
+    "1.299,00", "1 299,00", "1,99,999" or "19,99". The last separator is the
+    decimal point when both kinds appear; a lone separator followed by
+    exactly three digits is read as a thousands separator.
+    """
+    text = re.sub(r"[ \u00a0\u202f]", "", text).rstrip(".,")
+    if "." in text and "," in text:
+        decimal = "." if text.rfind(".") > text.rfind(",") else ","
+        thousands = "," if decimal == "." else "."
+        text = text.replace(thousands, "").replace(decimal, ".")
+    elif "." in text or "," in text:
+        separator = "." if "." in text else ","
+        whole, _, fraction = text.rpartition(separator)
+        if text.count(separator) > 1 or (len(fraction) == 3 and whole.strip("0")):
+            text = text.replace(separator, "")
+        else:
+            text = f"{whole}.{fraction}"
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+def parse_price(value: Any) -> Optional[float]:
+    """
+    Parse a price such as "1,99,999", "₹ 1,999.00", "1.299,00 €" or 1999
+    into a float. Returns None for anything that is not a positive number.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        price = float(value)
+    else:
+        match = PRICE_NUMBER.search(str(value))
+        if not match:
+            return None
+        price = _parse_number(match.group(0))
+        if price is None:
+            return None
+    return price if price > 0 else None
+
+def normalize_currency(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    value = value.strip()
+    return CURRENCY_SYMBOLS.get(value.upper(), value)
+
+def _product_result(name: Optional[str], price: Any, currency: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Build a scrape result, or None if any field is missing or implausible."""
+    name = " ".join(name.split()) if name else None
+    price = parse_price(price)
+    currency = normalize_currency(currency)
+    if not (name and price and currency):
+        return None
+    return {
+        "is_trackable": True,
+        "product_name": name,
+        "price": price,
+        "currency": currency,
+    }
+
+def _has_type(node: Dict[str, Any], type_name: str) -> bool:
+    node_type = node.get("@type")
+    types = node_type if isinstance(node_type, list) else [node_type]
+    return any(isinstance(t, str) and t.split("/")[-1] == type_name for t in types)
+
+def _walk_json_ld(node: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every object in a JSON-LD document, including @graph members."""
+    if isinstance(node, list):
+        for child in node:
+            yield from _walk_json_ld(child)
+    elif isinstance(node, dict):
+        yield node
+        for key in ("@graph", "mainEntity", "itemOffered"):
+            if key in node:
+                yield from _walk_json_ld(node[key])
+
+def _offer_price(offers: Any) -> tuple:
+    """Return (price, currency) from an Offer, AggregateOffer or list of them."""
+    for offer in offers if isinstance(offers, list) else [offers]:
+        if not isinstance(offer, dict):
+            continue
+        spec = offer.get("priceSpecification")
+        spec = spec[0] if isinstance(spec, list) and spec else spec
+        spec = spec if isinstance(spec, dict) else {}
+        price = offer.get("price") or offer.get("lowPrice") or spec.get("price")
+        currency = offer.get("priceCurrency") or spec.get("priceCurrency")
+        if parse_price(price):
+            return price, currency
+    return None, None
+
+def _from_json_ld(tree) -> Optional[Dict[str, Any]]:
+    for script in tree.xpath('//script[@type="application/ld+json"]'):
+        try:
+            document = json.loads(script.text_content())
+        except (ValueError, TypeError):
+            continue
+        for node in _walk_json_ld(document):
+            if not _has_type(node, "Product"):
+                continue
+            price, currency = _offer_price(node.get("offers"))
+            result = _product_result(node.get("name"), price, currency)
+            if result:
+                return result
+    return None
+
+def _itemprop_value(element) -> Optional[str]:
+    return element.get("content") or element.text_content()
+
+def _from_microdata(tree) -> Optional[Dict[str, Any]]:
+    for product in tree.xpath('//*[@itemscope][contains(@itemtype, "schema.org/Product")]'):
+        names = product.xpath('.//*[@itemprop="name"]')
+        prices = product.xpath('.//*[@itemprop="price" or @itemprop="lowPrice"]')
+        currencies = product.xpath('.//*[@itemprop="priceCurrency"]')
+        if not (names and prices and currencies):
+            continue
+        result = _product_result(
+            _itemprop_value(names[0]),
+            _itemprop_value(prices[0]),
+            _itemprop_value(currencies[0])
+        )
+        if result:
+            return result
+    return None
+
+def _meta(tree, *properties: str) -> Optional[str]:
+    for prop in properties:
+        values: List[str] = tree.xpath(f'//meta[@property="{prop}" or @name="{prop}"]/@content')
+        if values and values[0].strip():
+            return values[0]
+    return None
+
+def _from_open_graph(tree) -> Optional[Dict[str, Any]]:
+    return _product_result(
+        _meta(tree, "og:title"),
+        _meta(tree, "product:price:amount", "og:price:amount"),
+        _meta(tree, "product:price:currency", "og:price:currency")
+    )
+
+def extract_structured(page_html: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract product name, price and currency from schema.org JSON-LD,
+    microdata or OpenGraph product tags, in that order of preference.
+
+    Returns a result in the same shape as the LLM scrape, or None when the
+    page carries no complete, plausible product data.
+    """
+    try:
+        tree = lxml_html.fromstring(page_html)
+    except Exception as e:
+        logger.warning(f"Could not parse page for structured data: {e}")
+        return None
+
+    for extractor in (_from_json_ld, _from_microdata, _from_open_graph):
+        result = extractor(tree)
+        if result:
+            logger.info(f"Extracted product via {extractor.__name__[6:]}")
+            return result
+    return None
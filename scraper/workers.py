@@ -0,0 +1,158 @@
+import asyncio
+import multiprocessing
+from typing import Any, Callable, Optional, Set
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class WorkerError(Exception):
+    """A call failed inside a worker process, or the worker died."""
+
+def _serve(conn) -> None:
+    """Worker process loop: run each received call and send back its outcome."""
+    while True:
+        try:
+            func, args = conn.recv()
+        except EOFError:
+            return
+        try:
+            outcome = (True, func(*args))
+        except Exception as e:
+            # Exceptions may not survive pickling, so only their text is sent
+            outcome = (False, f"{type(e).__name__}: {e}")
+        try:
+            conn.send(outcome)
+        except Exception as e:
+            conn.send((False, f"Could not send result: {e}"))
+
+class Worker:
+    """One worker process and the pipe used to hand it calls."""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        # Set once the pipe fails; the process may not have been reaped yet
+        self._broken = False
+
+    @property
+    def alive(self) -> bool:
+        return not self._broken and self.process.is_alive()
+
+    async def call(self, func: Callable, args: tuple) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        fd = self.conn.fileno()
+
+        def on_readable() -> None:
+            loop.remove_reader(fd)
+            if future.done():
+                return
+            try:
+                future.set_result(self.conn.recv())
+            except (EOFError, OSError):
+                self._broken = True
+                future.set_exception(WorkerError("Worker process died"))
+
+        try:
+            self.conn.send((func, args))
+        except OSError:
+            self._broken = True
+            raise WorkerError("Worker process died")
+        loop.add_reader(fd, on_readable)
+        try:
+            ok, value = await future
+        finally:
+            loop.remove_reader(fd)
+        if not ok:
+            raise WorkerError(value)
+        return value
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+class SupervisedPool:
+    """
+    Pool of worker processes for scraper work that may hang. Unlike a
+    thread, a worker whose call times out or is cancelled is killed and
+    replaced, so a stuck page or LLM call cannot hold a slot forever.
+
+    Workers are forked from a fork server, so they start from a clean
+    process rather than a copy of the running bot.
+    """
+
+    def __init__(self, size: int, name: str):
+        self.size = size
+        self.name = name
+        self._context = multiprocessing.get_context("forkserver")
+        self._idle: Optional[asyncio.Queue] = None
+        self._respawning: Set[asyncio.Task] = set()
+
+    def _ensure_started(self) -> None:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for _ in range(self.size):
+                self._restore(None)
+            logger.info(f"Starting {self.size} {self.name} worker processes")
+
+    def _restore(self, worker: Optional[Worker]) -> None:
+        """
+        Replace a worker in the background. Its slot stays taken until the
+        new process is up, so the event loop never waits on a kill, join or
+        fork server handshake.
+        """
+        async def respawn() -> None:
+            if worker is not None:
+                await asyncio.to_thread(worker.kill)
+            replacement = None
+            while replacement is None:
+                try:
+                    replacement = await asyncio.to_thread(Worker, self._context)
+                except Exception as e:
+                    logger.error(f"Could not start {self.name} worker: {str(e)}")
+                    await asyncio.sleep(1)
+            self._idle.put_nowait(replacement)
+
+        task = asyncio.create_task(respawn())
+        self._respawning.add(task)
+        task.add_done_callback(self._respawning.discard)
+
+    async def _checkout(self) -> Worker:
+        """Wait for an idle worker, sending any that died off to be replaced."""
+        while True:
+            worker = await self._idle.get()
+            if worker.alive:
+                return worker
+            self._restore(worker)
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run `func(*args)` in a worker process.
+
+        Raises:
+            asyncio.TimeoutError: The call took longer than `timeout`; its
+                worker has been killed
+            WorkerError: The call raised, or its worker died
+        """
+        self._ensure_started()
+        worker = await self._checkout()
+        try:
+            result = await asyncio.wait_for(worker.call(func, args), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            logger.warning(f"Killing {self.name} worker {worker.process.pid} running {func.__name__}")
+            self._restore(worker)
+            raise
+        except WorkerError:
+            if worker.alive:
+                self._idle.put_nowait(worker)
+            else:
+                self._restore(worker)
+            raise
+        except BaseException:
+            self._idle.put_nowait(worker)
+            raise
+        self._idle.put_nowait(worker)
+        return result
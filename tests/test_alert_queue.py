@@ -0,0 +1,34 @@
+import asyncio
+import time
+from notifier import queue as queue_module
+from notifier.queue import AlertQueue
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        self.sent.append((chat_id, text, time.monotonic()))
+
+def test_throttled_chat_does_not_hold_up_other_chats(monkeypatch):
+    bot = FakeBot()
+    monkeypatch.setattr(queue_module, "bot", bot)
+
+    async def run():
+        alerts = AlertQueue()
+        started = time.monotonic()
+        # Chat 1 allows one message per second, so its later messages wait
+        for n in range(3):
+            await alerts.send(1, f"one-{n}")
+        await alerts.send(2, "two")
+        await asyncio.sleep(0.1)
+        two_sent = [sent_at - started for chat, _, sent_at in bot.sent if chat == 2]
+        await alerts.join()
+        for sender in alerts._senders:
+            sender.cancel()
+        return two_sent, time.monotonic() - started
+
+    two_sent, total = asyncio.run(run())
+    assert two_sent and two_sent[0] < 0.1
+    assert [text for chat, text, _ in bot.sent if chat == 1] == ["one-0", "one-1", "one-2"]
+    assert total >= 1.9
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import uuid
+import pytest
+from config import Config
+from scraper import browser
+from scraper.browser import BrowserInstance, BrowserPool, needs_rendering
+
+needs_proc = pytest.mark.skipif(not os.path.isdir("/proc"), reason="reads /proc")
+
+@pytest.fixture
+def marked_process():
+    """A child process tree started with a unique marker argument."""
+    marker = f"--price-tracker-browser={uuid.uuid4().hex}"
+    code = "import subprocess, sys, time; subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); time.sleep(30)"
+    process = subprocess.Popen([sys.executable, "-c", code, marker])
+    try:
+        yield marker, process
+    finally:
+        for pid, ppid in browser._process_tree().items():
+            if ppid == process.pid:
+                os.kill(pid, 9)
+        process.kill()
+        process.wait()
+
+def test_needs_rendering(monkeypatch):
+    monkeypatch.setattr(Config, "RENDER_DOMAINS", ["myntra.com"])
+    assert needs_rendering("https://www.myntra.com/shoes/123")
+    assert needs_rendering("https://myntra.com/shoes/123")
+    assert not needs_rendering("https://notmyntra.com/shoes/123")
+
+@needs_proc
+def test_finds_instance_by_marker_and_measures_its_tree(marked_process):
+    marker, process = marked_process
+    for _ in range(50):
+        children = [pid for pid, ppid in browser._process_tree().items() if ppid == process.pid]
+        if children:
+            break
+        time.sleep(0.05)
+
+    instance = BrowserInstance(browser=None, marker=marker)
+    rss = browser._instance_rss_mb(instance)
+    assert instance.pid == process.pid
+    # The marked process and its child, but not this test process
+    assert rss > browser._tree_rss_mb(children[0])
+    assert rss < browser._tree_rss_mb(os.getpid())
+
+def test_unknown_marker_measures_nothing():
+    instance = BrowserInstance(browser=None, marker=f"--missing={uuid.uuid4().hex}")
+    assert browser._instance_rss_mb(instance) is None
+
+class FakeBrowser:
+    closed = False
+    connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def close(self):
+        self.closed = True
+
+def release(pool, instance):
+    asyncio.run(pool._release(instance))
+
+def test_release_retires_only_the_instance_over_the_limit(monkeypatch):
+    monkeypatch.setattr(Config, "BROWSER_MEMORY_LIMIT_MB", 500)
+    monkeypatch.setattr(Config, "BROWSER_MAX_PAGES", 100)
+    usage = {"heavy": 800.0, "light": 200.0}
+    monkeypatch.setattr(browser, "_instance_rss_mb", lambda instance: usage[instance.marker])
+
+    pool = BrowserPool()
+    heavy = BrowserInstance(browser=FakeBrowser(), marker="heavy", active=1)
+    light = BrowserInstance(browser=FakeBrowser(), marker="light", active=1)
+    pool._instances = [heavy, light]
+
+    release(pool, light)
+    release(pool, heavy)
+    assert pool._instances == [light]
+    assert heavy.browser.closed and not light.browser.closed
+
+def test_release_retires_after_max_pages(monkeypatch):
+    monkeypatch.setattr(Config, "BROWSER_MAX_PAGES", 3)
+    monkeypatch.setattr(browser, "_instance_rss_mb", lambda instance: None)
+
+    pool = BrowserPool()
+    instance = BrowserInstance(browser=FakeBrowser(), marker="m", pages_served=3, active=1)
+    pool._instances = [instance]
+    release(pool, instance)
+    assert pool._instances == [] and instance.browser.closed
+
+def test_release_retires_a_crashed_browser(monkeypatch):
+    monkeypatch.setattr(Config, "BROWSER_MAX_PAGES", 100)
+    monkeypatch.setattr(browser, "_instance_rss_mb", lambda instance: None)
+
+    pool = BrowserPool()
+    instance = BrowserInstance(browser=FakeBrowser(), marker="m", active=1)
+    instance.browser.connected = False
+    pool._instances = [instance]
+    release(pool, instance)
+    assert pool._instances == [] and instance.retired
+
+def test_launch_does_not_block_renders_on_running_browsers(monkeypatch):
+    monkeypatch.setattr(Config, "BROWSER_POOL_SIZE", 2)
+
+    async def scenario():
+        pool = BrowserPool()
+        started, finish = asyncio.Event(), asyncio.Event()
+
+        async def slow_launch(instance):
+            started.set()
+            await finish.wait()
+            return FakeBrowser()
+
+        monkeypatch.setattr(pool, "_launch", slow_launch)
+        running = BrowserInstance(browser=FakeBrowser(), marker="running", active=1)
+        pool._instances = [running]
+
+        launching = asyncio.create_task(pool._acquire())
+        await started.wait()
+        # The pool is full now, so this picks the running browser right away
+        picked = await asyncio.wait_for(pool._acquire(), timeout=1)
+        assert picked is running
+        finish.set()
+        launched = await launching
+        assert launched.browser is not None and launched is not running
+
+    asyncio.run(scenario())
+
+def test_failed_launch_leaves_no_instance_behind(monkeypatch):
+    monkeypatch.setattr(Config, "BROWSER_POOL_SIZE", 1)
+
+    async def scenario():
+        pool = BrowserPool()
+        started, finish = asyncio.Event(), asyncio.Event()
+
+        async def failing_launch(instance):
+            started.set()
+            await finish.wait()
+            raise RuntimeError("no chromium")
+
+        monkeypatch.setattr(pool, "_launch", failing_launch)
+        launching = asyncio.create_task(pool._acquire())
+        await started.wait()
+        # Waits for the launch in progress instead of starting another
+        waiting = asyncio.create_task(pool._acquire())
+        await asyncio.sleep(0)
+        finish.set()
+        for task in (launching, waiting):
+            with pytest.raises(RuntimeError):
+                await task
+        assert pool._instances == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,20 @@
+from db.repositories.tracked_item import TrackedItemRepository
+
+class RecordingSession:
+    def __init__(self):
+        self.batches = []
+
+    def execute(self, statement, rows):
+        self.batches.append([row["id"] for row in rows])
+
+def test_rows_are_batched_by_the_columns_they_set():
+    checked = {"last_checked_at": 1, "next_check_at": 2, "current_price": 3.0, "check_interval": 60}
+    deferred = {"next_check_at": 2, "leased_by": None}
+    db = RecordingSession()
+    TrackedItemRepository.bulk_update(db, [
+        {"id": 1, **checked},
+        {"id": 2, **deferred},
+        {"id": 3, **checked},
+        {"id": 4, **deferred},
+    ])
+    assert db.batches == [[1, 3], [2, 4]]
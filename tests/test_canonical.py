@@ -0,0 +1,63 @@
+import pytest
+from scraper.canonical import canonicalize_url
+
+@pytest.mark.parametrize("url", [
+    "https://www.amazon.in/Some-Product-Name/dp/B0ABCDEFGH/ref=sr_1_3?crid=X&keywords=phone",
+    "https://amazon.in/dp/b0abcdefgh?tag=affiliate-21&psc=1",
+    "https://m.amazon.in/gp/product/B0ABCDEFGH/",
+    "https://www.amazon.in/gp/aw/d/B0ABCDEFGH?th=1",
+])
+def test_amazon_links_reduce_to_asin(url):
+    assert canonicalize_url(url) == "https://www.amazon.in/dp/B0ABCDEFGH"
+
+def test_amazon_keeps_country_domain():
+    assert canonicalize_url("https://www.amazon.co.uk/dp/B0ABCDEFGH") == "https://www.amazon.co.uk/dp/B0ABCDEFGH"
+
+def test_amazon_without_asin_falls_back_to_generic_rules():
+    url = "https://www.amazon.in/s?k=phone&utm_source=x"
+    assert canonicalize_url(url) == "https://www.amazon.in/s?k=phone"
+
+@pytest.mark.parametrize("url", [
+    "https://www.flipkart.com/cool-phone/p/itm123abc?pid=MOBABC&lid=LST1&marketplace=FLIPKART",
+    "https://flipkart.com/cool-phone/p/itm123abc/?pid=MOBABC&affid=someone&utm_source=share",
+    "https://dl.flipkart.com/dl/cool-phone/p/itm123abc?pid=MOBABC&cmpid=product.share.pp",
+])
+def test_flipkart_links_keep_slug_item_and_pid(url):
+    assert canonicalize_url(url) == "https://www.flipkart.com/cool-phone/p/itm123abc?pid=MOBABC"
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://shop.example.com/item/42?utm_source=mail&utm_campaign=x&color=red",
+     "https://shop.example.com/item/42?color=red"),
+    ("https://shop.example.com/item/42/?gclid=abc&fbclid=def&size=m&color=red",
+     "https://shop.example.com/item/42?color=red&size=m"),
+    ("https://SHOP.example.com/item/42?sessionid=123#reviews",
+     "https://shop.example.com/item/42"),
+    ("https://amp.shop.example.com/amp/item/42?amp=1",
+     "https://shop.example.com/item/42"),
+    ("https://m.shop.example.com/item/42?utm_medium=app",
+     "https://shop.example.com/item/42"),
+    ("https://mobile.example.com/item/42",
+     "https://example.com/item/42"),
+])
+def test_generic_links_drop_tracking_params(url, expected):
+    assert canonicalize_url(url) == expected
+
+@pytest.mark.parametrize("url", [
+    "https://www.amazon.in/Some-Product-Name/dp/B0ABCDEFGH/ref=sr_1_3",
+    "https://dl.flipkart.com/dl/cool-phone/p/itm123abc?pid=MOBABC",
+    "https://shop.example.com/item/42/?utm_source=mail&b=2&a=1",
+])
+def test_canonicalization_is_idempotent(url):
+    once = canonicalize_url(url)
+    assert canonicalize_url(once) == once
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://shop.example.com/#/product/42", "https://shop.example.com/#/product/42"),
+    ("https://shop.example.com/?utm_source=x#!/product/42", "https://shop.example.com/#!/product/42"),
+    ("https://shop.example.com/item/42#reviews", "https://shop.example.com/item/42"),
+])
+def test_route_fragments_are_kept(url, expected):
+    assert canonicalize_url(url) == expected
+
+def test_hash_routed_products_get_distinct_keys():
+    assert canonicalize_url("https://shop.example.com/#/product/42") != canonicalize_url("https://shop.example.com/#/product/43")
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+from notifier import messages as alert_messages
+
+def make_item(name="Phone", link="https://www.example.com/p/1"):
+    return SimpleNamespace(name=name, currency="INR", target_price=1000.0, link=link)
+
+def assert_balanced(text):
+    # Every bold and link entity must be closed within the message
+    assert text.count("*") % 2 == 0
+    assert text.count("[") == text.count("]")
+
+def test_short_digest_is_one_message():
+    entries = [alert_messages.format_digest_entry(make_item(f"Item {n}"), 900.0) for n in range(3)]
+    messages = alert_messages.format_digest(entries)
+    assert len(messages) == 1
+    assert all(entry in messages[0] for entry in entries)
+
+def test_long_digest_is_split_on_entry_boundaries():
+    entries = [alert_messages.format_digest_entry(make_item(f"Item {n}"), 900.0) for n in range(200)]
+    messages = alert_messages.format_digest(entries)
+    assert len(messages) > 1
+    for message in messages:
+        assert len(message) <= alert_messages.MAX_MESSAGE_LENGTH
+        assert_balanced(message)
+    joined = "".join(messages)
+    assert all(entry in joined for entry in entries)
+
+def test_oversized_entry_drops_whole_lines():
+    item = make_item(link="https://www.example.com/p/" + "x" * 5000)
+    messages = alert_messages.format_digest([alert_messages.format_digest_entry(item, 900.0)])
+    assert len(messages) == 1
+    assert len(messages[0]) <= alert_messages.MAX_MESSAGE_LENGTH
+    assert "[Link]" not in messages[0]
+    assert "*Phone*" in messages[0]
+    assert_balanced(messages[0])
+
+def test_item_names_cannot_break_markdown():
+    item = make_item(name="Deal *50%* off_now [new] `x` " + "y" * 500)
+    for text in (alert_messages.format_message(item, 900.0), alert_messages.format_digest_entry(item, 900.0)):
+        assert_balanced(text)
+        assert "_" not in text.split("(")[0]
+    name_line = alert_messages.format_digest_entry(item, 900.0).split("\n")[0]
+    assert len(name_line) <= alert_messages.MAX_NAME_LENGTH + 2
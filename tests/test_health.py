@@ -0,0 +1,104 @@
+import pytest
+from config import Config
+from scraper import health
+from scraper.health import CLOSED, HALF_OPEN, OPEN, DomainHealth
+
+URL = "https://shop.example.com/p/1"
+
+@pytest.fixture(autouse=True)
+def circuit_config(monkeypatch):
+    monkeypatch.setattr(Config, "CIRCUIT_WINDOW", 10)
+    monkeypatch.setattr(Config, "CIRCUIT_MIN_SAMPLES", 4)
+    monkeypatch.setattr(Config, "CIRCUIT_ERROR_RATE", 0.5)
+    monkeypatch.setattr(Config, "CIRCUIT_COOLDOWN", 30)
+    monkeypatch.setattr(Config, "CIRCUIT_EXTRACTION_ERROR_RATE", 0.8)
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(health.time, "monotonic", lambda: now[0])
+    return now
+
+def state(domain_health):
+    return domain_health.snapshot()["shop.example.com"]["state"]
+
+def open_circuit(domain_health):
+    for _ in range(4):
+        domain_health.record_status(URL, 503)
+
+def test_opens_after_enough_failures():
+    domain_health = DomainHealth()
+    for _ in range(3):
+        domain_health.record_status(URL, None)
+    assert state(domain_health) == CLOSED
+    domain_health.record_status(URL, 429)
+    assert state(domain_health) == OPEN
+    assert not domain_health.allow(URL)
+    assert domain_health.unhealthy()
+
+def test_missing_product_pages_do_not_count_as_failures():
+    domain_health = DomainHealth()
+    for status in (404, 410, 404, 200, 304):
+        domain_health.record_status(URL, status)
+    assert state(domain_health) == CLOSED
+    assert domain_health.snapshot()["shop.example.com"]["failures"] == 0
+
+def test_blocked_requests_count_as_failures():
+    domain_health = DomainHealth()
+    for _ in range(4):
+        domain_health.record_status(URL, 403)
+    assert state(domain_health) == OPEN
+
+def test_some_untrackable_pages_keep_the_circuit_closed():
+    domain_health = DomainHealth()
+    for trackable in (True, False, True, False, True, True):
+        domain_health.record_status(URL, 200)
+        domain_health.record_extraction(URL, trackable)
+    assert state(domain_health) == CLOSED
+    health_snapshot = domain_health.snapshot()["shop.example.com"]
+    assert health_snapshot["not_trackable"] == 2
+    assert health_snapshot["extraction_error_rate"] == round(2 / 6, 3)
+
+def test_pages_that_stop_parsing_open_the_circuit():
+    domain_health = DomainHealth()
+    for _ in range(4):
+        domain_health.record_status(URL, 200)
+        domain_health.record_extraction(URL, False)
+    assert state(domain_health) == OPEN
+    assert domain_health.snapshot()["shop.example.com"]["failures"] == 0
+
+def test_half_open_admits_a_single_trial(clock):
+    domain_health = DomainHealth()
+    open_circuit(domain_health)
+    assert domain_health.retry_in(URL) == 30
+
+    clock[0] += 30
+    assert domain_health.allow(URL)
+    assert state(domain_health) == HALF_OPEN
+    assert not domain_health.allow(URL)
+
+def test_successful_trial_closes(clock):
+    domain_health = DomainHealth()
+    open_circuit(domain_health)
+    clock[0] += 30
+    assert domain_health.allow(URL)
+    domain_health.record_status(URL, 200)
+    assert state(domain_health) == CLOSED
+    assert domain_health.allow(URL)
+
+def test_failed_trial_reopens(clock):
+    domain_health = DomainHealth()
+    open_circuit(domain_health)
+    clock[0] += 30
+    assert domain_health.allow(URL)
+    domain_health.record_status(URL, 500)
+    assert state(domain_health) == OPEN
+    assert domain_health.retry_in(URL) == 30
+
+def test_cancelled_trial_lets_another_through(clock):
+    domain_health = DomainHealth()
+    open_circuit(domain_health)
+    clock[0] += 30
+    assert domain_health.allow(URL)
+    domain_health.cancel_trial(URL)
+    assert domain_health.allow(URL)
@@ -0,0 +1,18 @@
+from scraper.minimizer import minimize_page
+
+def test_keeps_price_inside_add_to_cart_form():
+    page = """
+    <html><head><title>Cool Mug</title></head><body>
+      <h1>Cool Mug</h1>
+      <form action="/cart/add">
+        <div class="product-price">$19.99</div>
+        <select name="size"><option>Large - $24.99</option></select>
+        <input type="hidden" name="id" value="42">
+        <button type="submit">Add to cart</button>
+      </form>
+    </body></html>
+    """
+    excerpt, _, _ = minimize_page(page, max_tokens=1000)
+    assert "$19.99" in excerpt
+    assert "Add to cart" not in excerpt
+    assert "$24.99" not in excerpt
@@ -0,0 +1,67 @@
+import asyncio
+import contextlib
+from types import SimpleNamespace
+from notifier import outbox as outbox_module
+from notifier.outbox import AlertOutboxRelay
+
+class FakeRepository:
+    def __init__(self, rows):
+        self.rows = rows
+        self.deleted = []
+
+    def claim(self, db, **kwargs):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def delete_many(self, db, alert_ids):
+        self.deleted.extend(alert_ids)
+
+class FakeQueue:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, chat_id, text, parse_mode=None, on_done=None):
+        self.sent.append((chat_id, text, on_done))
+
+def row(id, chat_id, text, digest_entry=None):
+    return SimpleNamespace(id=id, chat_id=chat_id, text=text,
+                           parse_mode="Markdown", digest_entry=digest_entry)
+
+def make_relay(monkeypatch, rows):
+    queue = FakeQueue()
+    monkeypatch.setattr(outbox_module, "alert_queue", queue)
+    monkeypatch.setattr(outbox_module, "get_db", contextlib.nullcontext)
+    relay = AlertOutboxRelay()
+    relay.repository = FakeRepository(rows)
+    return relay, queue
+
+def test_digest_rows_are_combined_per_chat(monkeypatch):
+    relay, queue = make_relay(monkeypatch, [
+        row(1, 10, "single alert"),
+        row(2, 20, "full 2", "*A*"),
+        row(3, 20, "full 3", "*B*"),
+        row(4, 30, "full 4", "*C*"),
+    ])
+    assert asyncio.run(relay.relay_once()) == 4
+
+    texts = {chat_id: text for chat_id, text, _ in queue.sent}
+    assert len(queue.sent) == 3
+    assert texts[10] == "single alert"
+    assert "*A*" in texts[20] and "*B*" in texts[20]
+    # A lone drop in digest mode is sent as the regular alert
+    assert texts[30] == "full 4"
+
+def test_rows_finish_once_all_their_messages_are_done(monkeypatch):
+    entries = [row(n, 20, f"full {n}", "*Item*\n" + "x" * 1000) for n in range(1, 9)]
+    relay, queue = make_relay(monkeypatch, entries)
+    asyncio.run(relay.relay_once())
+    assert len(queue.sent) > 1
+
+    for _, _, on_done in queue.sent[:-1]:
+        on_done()
+    relay._delete_finished()
+    assert relay.repository.deleted == []
+
+    queue.sent[-1][2]()
+    relay._delete_finished()
+    assert sorted(relay.repository.deleted) == list(range(1, 9))
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from utils.rate_limit import TokenBucket
+
+def test_burst_up_to_capacity_is_immediate():
+    async def run():
+        bucket = TokenBucket(rate=1, capacity=3)
+        started = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) < 0.05
+
+def test_waiters_are_spaced_by_rate():
+    async def run():
+        bucket = TokenBucket(rate=20, capacity=1)
+        started = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+        return time.monotonic() - started
+
+    # One token up front, then four more at 20/s
+    assert 0.18 <= asyncio.run(run()) < 0.4
+
+def test_waiting_does_not_block_the_event_loop():
+    async def run():
+        bucket = TokenBucket(rate=2, capacity=1)
+        await bucket.acquire()
+        waiter = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0)
+        # The waiter holds no lock, so the bucket can still be inspected and paused
+        assert bucket.ready_in() > 0
+        started = time.monotonic()
+        await asyncio.sleep(0.05)
+        assert time.monotonic() - started < 0.1
+        await waiter
+
+    asyncio.run(run())
+
+def test_pause_holds_back_waiters():
+    async def run():
+        bucket = TokenBucket(rate=100, capacity=1)
+        bucket.pause(0.2)
+        assert bucket.ready_in() > 0.1
+        started = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.19
+
+def test_pause_during_wait_takes_a_new_reservation():
+    async def run():
+        bucket = TokenBucket(rate=10, capacity=1)
+        await bucket.acquire()
+        started = time.monotonic()
+        waiter = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0.02)
+        bucket.pause(0.3)
+        await waiter
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.3
+
+def test_idle_after_refill():
+    bucket = TokenBucket(rate=1000, capacity=1)
+    assert bucket.idle
+    bucket.pause(0)
+    time.sleep(0.01)
+    assert bucket.idle
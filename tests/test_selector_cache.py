@@ -0,0 +1,49 @@
+from scraper.selector_cache import SelectorCache, apply_selectors, derive_selectors
+from scraper.storage import SqliteStore
+
+URL = "https://shop.example.com/p/123"
+
+PAGE = """
+<html><body>
+  <h1 class="product-title">Cool Mug</h1>
+  <div class="related"><span class="price">$4.99</span></div>
+  <div class="buy-box"><span class="price" id="main-price">$19.99</span></div>
+</body></html>
+"""
+
+ENTRY = {
+    "price_xpath": '//span[@class="price"]',
+    "name_xpath": '//h1[@class="product-title"]',
+    "currency": "USD",
+    "sample_price": 19.99,
+}
+
+def make_cache(tmp_path):
+    cache = SelectorCache.__new__(SelectorCache)
+    cache.store = SqliteStore("selectors", path=str(tmp_path / "selectors.db"))
+    return cache
+
+def test_derived_price_selector_matches_only_the_product():
+    price_xpath, name_xpath = derive_selectors(PAGE, {"product_name": "Cool Mug", "price": "19.99", "currency": "USD"})
+    assert price_xpath == '//span[@id="main-price"]'
+    assert apply_selectors(PAGE, {"price_xpath": price_xpath, "name_xpath": name_xpath}) == ("Cool Mug", [19.99])
+
+def test_ambiguous_prices_forget_the_selectors(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.store.set("shop.example.com/p/*", ENTRY)
+    name, prices = apply_selectors(PAGE, ENTRY)
+    assert prices == [4.99, 19.99]
+    assert cache.result(URL, ENTRY, name, prices) is None
+    assert cache.get(URL) is None
+
+def test_price_far_from_last_price_is_not_trusted(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.store.set("shop.example.com/p/*", ENTRY)
+    assert cache.result(URL, ENTRY, "Cool Mug", [4.99], last_price=19.99) is None
+    # The layout may still be right, so the selectors are kept
+    assert cache.get(URL) == ENTRY
+
+def test_price_near_last_price_is_used(tmp_path):
+    cache = make_cache(tmp_path)
+    result = cache.result(URL, ENTRY, "Cool Mug", [17.99], last_price=19.99)
+    assert result == {"is_trackable": True, "product_name": "Cool Mug", "price": 17.99, "currency": "USD"}
@@ -0,0 +1,104 @@
+import json
+import pytest
+from scraper.structured import extract_structured, normalize_currency, parse_price
+
+def page(head="", body=""):
+    return f"<html><head>{head}</head><body>{body}</body></html>"
+
+def json_ld(document):
+    return f'<script type="application/ld+json">{json.dumps(document)}</script>'
+
+@pytest.mark.parametrize("value, expected", [
+    ("1,99,999", 199999.0),
+    ("₹ 1,999.00", 1999.0),
+    ("Rs. 499", 499.0),
+    ("1.299,00", 1299.0),
+    ("1.299 €", 1299.0),
+    ("1 299,00 €", 1299.0),
+    ("19,99 €", 19.99),
+    ("1,299", 1299.0),
+    ("0.5", 0.5),
+    (1999, 1999.0),
+    (12.5, 12.5),
+    ("0", None),
+    ("free", None),
+    (None, None),
+    (True, None),
+])
+def test_parse_price(value, expected):
+    assert parse_price(value) == expected
+
+def test_normalize_currency():
+    assert normalize_currency(" inr ") == "₹"
+    assert normalize_currency("USD") == "$"
+    assert normalize_currency("CHF") == "CHF"
+    assert normalize_currency("") is None
+
+def test_json_ld_product_in_graph():
+    document = {"@graph": [
+        {"@type": "WebPage", "name": "Not a product"},
+        {
+            "@type": ["Product"],
+            "name": "  Cool   Phone ",
+            "offers": {"@type": "AggregateOffer", "lowPrice": "18,999", "priceCurrency": "INR"},
+        },
+    ]}
+    assert extract_structured(page(head=json_ld(document))) == {
+        "is_trackable": True,
+        "product_name": "Cool Phone",
+        "price": 18999.0,
+        "currency": "₹",
+    }
+
+def test_json_ld_price_specification():
+    document = {
+        "@type": "http://schema.org/Product",
+        "name": "Kettle",
+        "offers": [{"priceSpecification": [{"price": 25, "priceCurrency": "EUR"}]}],
+    }
+    result = extract_structured(page(head=json_ld(document)))
+    assert result["price"] == 25.0 and result["currency"] == "€"
+
+def test_invalid_json_ld_falls_through_to_microdata():
+    body = (
+        '<div itemscope itemtype="https://schema.org/Product">'
+        '<h1 itemprop="name">Lamp</h1>'
+        '<span itemprop="price" content="49.99">$49.99</span>'
+        '<meta itemprop="priceCurrency" content="USD">'
+        '</div>'
+    )
+    html = page(head='<script type="application/ld+json">{not json</script>', body=body)
+    assert extract_structured(html) == {
+        "is_trackable": True,
+        "product_name": "Lamp",
+        "price": 49.99,
+        "currency": "$",
+    }
+
+def test_microdata_with_european_separators():
+    body = (
+        '<div itemscope itemtype="https://schema.org/Product">'
+        '<h1 itemprop="name">Espresso Machine</h1>'
+        '<span itemprop="price">1.299,00</span>'
+        '<meta itemprop="priceCurrency" content="EUR">'
+        '</div>'
+    )
+    result = extract_structured(page(body=body))
+    assert result["price"] == 1299.0 and result["currency"] == "€"
+
+def test_open_graph_product_tags():
+    head = (
+        '<meta property="og:title" content="Desk Chair">'
+        '<meta property="product:price:amount" content="7,499">'
+        '<meta property="product:price:currency" content="INR">'
+    )
+    result = extract_structured(page(head=head))
+    assert result["product_name"] == "Desk Chair" and result["price"] == 7499.0
+
+@pytest.mark.parametrize("html", [
+    page(body="<p>No product data here</p>"),
+    page(head=json_ld({"@type": "Product", "name": "No price", "offers": {"price": "0", "priceCurrency": "INR"}})),
+    page(head='<meta property="og:title" content="Only a title">'),
+])
+def test_incomplete_data_returns_none(html):
+    assert extract_structured(html) is None
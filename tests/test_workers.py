@@ -0,0 +1,96 @@
+import asyncio
+import os
+import time
+import pytest
+from scraper.workers import SupervisedPool, WorkerError
+
+# Workers run in fresh processes, so calls use stdlib functions that can be
+# pickled by reference rather than anything defined in this module
+
+def run_with_pool(size, scenario):
+    async def main():
+        pool = SupervisedPool(size, "test")
+        try:
+            return await scenario(pool)
+        finally:
+            await asyncio.gather(*pool._respawning)
+            while not pool._idle.empty():
+                pool._idle.get_nowait().kill()
+
+    return asyncio.run(main())
+
+def test_runs_calls_in_another_process():
+    async def scenario(pool):
+        return await pool.run(os.getpid)
+
+    assert run_with_pool(1, scenario) != os.getpid()
+
+def test_exception_keeps_the_worker():
+    async def scenario(pool):
+        first = await pool.run(os.getpid)
+        with pytest.raises(WorkerError, match="ValueError"):
+            await pool.run(int, "not a number")
+        return first, await pool.run(os.getpid)
+
+    first, after = run_with_pool(1, scenario)
+    assert first == after
+
+def test_timeout_kills_and_replaces_the_worker_without_blocking():
+    async def scenario(pool):
+        first = await pool.run(os.getpid)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(time.sleep, 30, timeout=0.2)
+        timed_out_after = time.monotonic() - started
+        # The only slot stays taken until the replacement is up
+        replacement = await pool.run(os.getpid)
+        ticking.cancel()
+        return first, replacement, timed_out_after, ticks
+
+    first, replacement, timed_out_after, ticks = run_with_pool(1, scenario)
+    assert timed_out_after < 1
+    assert replacement != first
+    assert ticks > 10
+    with pytest.raises(ProcessLookupError):
+        os.kill(first, 0)
+
+def test_cancelled_call_replaces_the_worker():
+    async def scenario(pool):
+        first = await pool.run(os.getpid)
+        call = asyncio.create_task(pool.run(time.sleep, 30))
+        await asyncio.sleep(0.2)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        return first, await pool.run(os.getpid)
+
+    first, replacement = run_with_pool(1, scenario)
+    assert replacement != first
+
+def test_dead_worker_is_respawned():
+    async def scenario(pool):
+        first = await pool.run(os.getpid)
+        with pytest.raises(WorkerError, match="died"):
+            await pool.run(os._exit, 1)
+        return first, await pool.run(os.getpid)
+
+    first, replacement = run_with_pool(1, scenario)
+    assert replacement != first
+
+def test_calls_run_concurrently_across_workers():
+    async def scenario(pool):
+        await asyncio.gather(*(pool.run(os.getpid) for _ in range(2)))
+        started = time.monotonic()
+        await asyncio.gather(*(pool.run(time.sleep, 0.3) for _ in range(2)))
+        return time.monotonic() - started
+
+    assert run_with_pool(2, scenario) < 0.55
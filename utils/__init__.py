@@ -1 +1,3 @@
 from .logger import get_logger
+from .startup import log_startup_report
+from .url import get_domain
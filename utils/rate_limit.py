@@ -0,0 +1,69 @@
+import asyncio
+import time
+from typing import Optional
+
+class TokenBucket:
+    """
+    Async token bucket allowing `rate` acquisitions per second on average,
+    with bursts of up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def idle(self) -> bool:
+        """True when the bucket is full, i.e. nobody has used it recently."""
+        now = time.monotonic()
+        self._refill(now)
+        return self._tokens >= self.capacity and now >= self._paused_until
+
+    def ready_in(self) -> float:
+        """Seconds until a token can be taken, 0 if one is available now."""
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._refill(now)
+        return max(1 - self._tokens, 0.0) / self.rate
+
+    def _reserve(self, now: float) -> float:
+        """
+        Take a token, going into debt if there is none, and return how long
+        the caller must wait before using it.
+        """
+        self._refill(now)
+        self._tokens -= 1
+        return max(-self._tokens, 0.0) / self.rate
+
+    async def acquire(self) -> None:
+        """
+        Wait until a token is available and take it. The token is reserved
+        before sleeping, so waiters are served in order without holding a
+        lock while they wait.
+        """
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            paused_until = self._paused_until
+            wait = self._reserve(now)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+            # A pause while sleeping wipes out the reservation, so take a new one
+            if self._paused_until == paused_until:
+                return
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the next `seconds`, e.g. after a 429."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
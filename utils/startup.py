@@ -0,0 +1,52 @@
+import os
+import resource
+import sys
+from typing import List, Optional
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Dependencies that make startup slow and memory-hungry when imported eagerly
+HEAVY_MODULES = (
+    "scrapegraphai",
+    "langchain",
+    "langchain_core",
+    "transformers",
+    "onnxruntime",
+    "torch",
+    "playwright",
+    "groq",
+)
+
+def process_uptime() -> Optional[float]:
+    """Seconds since this process started, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the command name; starttime is the 22nd field overall
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            system_uptime = float(f.read().split()[0])
+    except (OSError, IndexError, ValueError):
+        return None
+    return system_uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def loaded_heavy_modules() -> List[str]:
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+def log_startup_report(component: str) -> None:
+    """
+    Log how long `component` took to become ready, its peak memory and
+    which heavy dependencies were imported on the way. For a per-module
+    breakdown, run with `python -X importtime`.
+    """
+    uptime = process_uptime()
+    elapsed = f"{uptime:.2f}s" if uptime is not None else "unknown time"
+    heavy = ", ".join(loaded_heavy_modules()) or "none"
+    logger.info(
+        f"{component} ready after {elapsed}, peak RSS {peak_rss_mb():.0f} MB, "
+        f"heavy modules loaded: {heavy}"
+    )
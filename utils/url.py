@@ -0,0 +1,8 @@
+from urllib.parse import urlparse
+
+def get_domain(url: str) -> str:
+    """Return the lowercase host of a URL without the leading 'www.'."""
+    host = (urlparse(url).hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host
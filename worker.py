@@ -0,0 +1,23 @@
+import asyncio
+from cron.scheduler import price_check_scheduler
+from scraper.scraper import scraper
+from utils.logger import get_logger
+from utils.startup import log_startup_report
+from config import Config
+
+logger = get_logger(__name__)
+
+async def main() -> None:
+    """Run only the price checker. Start as many of these as needed."""
+    try:
+        logger.info(f"Starting price check worker {Config.WORKER_ID}")
+        log_startup_report("Price check worker")
+        await price_check_scheduler.run()
+    except Exception as e:
+        logger.error(f"Error in worker: {e}")
+        raise
+    finally:
+        await scraper.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())